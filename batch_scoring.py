@@ -0,0 +1,75 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+import numpy as np
+
+from roll_codes import codes, place, to_counts
+from score_table import table
+
+# value of one die per face, zero for an empty slot, so a roll's code is one gather and a sum.
+places = np.array(place, dtype=np.int32)
+# value of one die per face, 1 - 6, for packing count vectors.
+powers = places[1:]
+
+# Score, validity and best keep of every roll, indexed by roll code. Codes not in the table are never looked up.
+code_scores = np.zeros(7 ** 6, dtype=np.int32)
+code_valid = np.zeros(7 ** 6, dtype=bool)
+code_counts = np.zeros((7 ** 6, 6), dtype=np.int8)
+code_keeps = np.zeros((7 ** 6, 6), dtype=np.int8)
+for _code in codes:
+    _score = table[_code]
+    code_scores[_code] = _score.score
+    code_valid[_code] = not _score.errors
+    code_counts[_code] = to_counts(_code)
+    code_keeps[_code] = to_counts(_score.keep)
+
+
+def dice_to_codes(dice) -> np.ndarray:
+    """Convert an (N, k) array of dice to an (N,) array of roll codes.
+
+    :param dice: Array-like of die faces 1 - 6. Zeros are empty slots, so rolls of different sizes can share an array.
+    :return: (N,) int32 array of roll codes.
+    """
+    dice = np.asarray(dice)
+    if dice.ndim == 1:
+        dice = dice[:, np.newaxis]
+    return places[dice].sum(axis=1, dtype=np.int32)
+
+
+def dice_to_counts(dice) -> np.ndarray:
+    """Convert an (N, k) array of dice to an (N, 6) array of how many of each face was rolled.
+
+    :param dice: Array-like of die faces 1 - 6, zero padded.
+    :return: (N, 6) int8 array of face counts.
+    """
+    return code_counts[dice_to_codes(dice)]
+
+
+def score_codes(roll_codes) -> tuple:
+    """Score, validate and choose the best keep for N rolls at once.
+
+    Matches Game.keep_score, Game.validate_choice and Game.choose_dice row for row.
+
+    :param roll_codes: (N,) array-like of roll codes.
+    :return: Tuple of (scores, valid, keeps). scores is an (N,) int32 array, valid is an (N,) bool array that is
+        True where validate_choice finds no errors, and keeps is an (N, 6) int8 array of face counts to keep.
+    """
+    roll_codes = np.asarray(roll_codes)
+    return code_scores[roll_codes], code_valid[roll_codes], code_keeps[roll_codes]
+
+
+def score_counts(counts) -> tuple:
+    """Score, validate and choose the best keep for N rolls given as face counts.
+
+    :param counts: (N, 6) array-like of face counts.
+    :return: Same as score_codes.
+    """
+    return score_codes(np.asarray(counts, dtype=np.int32) @ powers)
+
+
+def score_dice(dice) -> tuple:
+    """Score, validate and choose the best keep for an (N, k) array of dice.
+
+    :param dice: Array-like of die faces 1 - 6, zero padded.
+    :return: Same as score_codes.
+    """
+    return score_codes(dice_to_codes(dice))
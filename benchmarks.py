@@ -0,0 +1,163 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from collections import namedtuple
+from dice import DiceSource
+from engine import GameEngine
+from logic import Game
+from roll_codes import encode
+from tournament import play_game, strategy
+
+baseline_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks.json')
+
+# stands in for a DieScatter, which choose_dice only asks for its id.
+Die = namedtuple('Die', 'id')
+
+# rolls that exercise every scoring rule at once: straights, three pairs, big sets, sets with singles.
+worst_rolls = [[1, 2, 3, 4, 5, 6], [6, 5, 4, 3, 2, 1], [2, 2, 3, 3, 4, 4], [1, 1, 5, 5, 6, 6],
+               [1, 1, 1, 1, 1, 1], [5, 5, 5, 5, 5, 1], [2, 2, 2, 2, 6, 6], [3, 3, 3, 1, 5, 4],
+               [4, 4, 4, 4, 1, 5], [6, 6, 6, 6, 6, 2]] * 100
+
+
+def realistic_rolls(count: int = 1000, seed: int = 0) -> list:
+    """Rolls of 1 - 6 dice, sized the way turns use them: mostly six dice, fewer as dice are kept."""
+    dice = DiceSource(seed)
+    sizes = [6, 6, 6, 5, 5, 4, 4, 3, 2, 1]
+    return [dice.roll(sizes[i % len(sizes)]) for i in range(count)]
+
+
+def time_calls(func, inputs, repeat: int = 7, min_time: float = .05) -> dict:
+    """Time func over every input, keeping the fastest of repeat samples.
+
+    Each sample runs enough passes over inputs to take at least min_time, so short benchmarks aren't swamped by
+    timer and scheduler noise.
+
+    :param func: Function of one input.
+    :param inputs: List of inputs.
+    :param repeat: Number of timed samples.
+    :param min_time: Shortest sample, in seconds.
+    :return: Dict of ops_per_sec and ns_per_call.
+    """
+    passes = 1
+    best = float('inf')
+    for _ in range(repeat):
+        while True:
+            start = time.perf_counter()
+            for _ in range(passes):
+                for item in inputs:
+                    func(item)
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+            passes *= 2
+        best = min(best, elapsed / passes)
+    return {'ops_per_sec': len(inputs) / best, 'ns_per_call': best / len(inputs) * 1e9}
+
+
+def reference(item: int) -> int:
+    """Fixed pure-Python workload timed alongside the benchmarks, to factor out how fast the machine is today."""
+    total = 0
+    for i in range(item):
+        total += i * i
+    return total
+
+
+def turn_player():
+    """Function playing one heuristic turn per call, starting a new solo game whenever one finishes."""
+    engine = GameEngine(['heuristic'], DiceSource(0))
+
+    def single_turn(_) -> None:
+        nonlocal engine
+        if engine.over:
+            engine = GameEngine(['heuristic'], DiceSource(engine.game.dice_source.seed + 1))
+        engine.play_turn(strategy('heuristic')(engine))
+    return single_turn
+
+
+def full_game(seed: int) -> None:
+    play_game((seed, seed, ['heuristic', 'points']))
+
+
+def benchmarks() -> dict:
+    """Run every benchmark.
+
+    :return: Dict of benchmark name: timings.
+    """
+    game = Game(['bench'])
+    mixes = {'realistic': realistic_rolls(), 'worst': worst_rolls}
+    results = {}
+    for mix, rolls in mixes.items():
+        codes = [encode(roll) for roll in rolls]
+        dice = [[Die(str(face)) for face in roll] for roll in rolls]
+        results[f'keep_score/{mix}'] = time_calls(game.keep_score, rolls)
+        results[f'validate_choice/{mix}'] = time_calls(game.validate_choice, rolls)
+        results[f'choose_dice/{mix}'] = time_calls(game.choose_dice, dice)
+        results[f'choose_dice_code/{mix}'] = time_calls(game.choose_dice, codes)
+        results[f'is_three_pair/{mix}'] = time_calls(game.is_three_pair, rolls)
+        results[f'is_straight/{mix}'] = time_calls(game.is_straight, rolls)
+    # warm the strategy caches so turns and games time play rather than setup.
+    full_game(0)
+    results['single_turn'] = time_calls(turn_player(), range(2000), repeat=5)
+    results['full_game'] = time_calls(full_game, range(100), repeat=5)
+    speed = time_calls(reference, [20] * 1000)['ns_per_call']
+    for timings in results.values():
+        timings['relative'] = timings['ns_per_call'] / speed
+    return results
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    """Benchmarks slowing down more than tolerance from baseline.
+
+    Costs are compared relative to the reference workload, so a machine running slower than when the baseline was
+    saved doesn't look like a regression.
+
+    :return: List of (name, baseline relative cost, current relative cost).
+    """
+    return [(name, baseline[name]['relative'], timings['relative'])
+            for name, timings in results.items()
+            if name in baseline and timings['relative'] > baseline[name]['relative'] * (1 + tolerance)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scoring and simulation against a saved baseline.')
+    parser.add_argument('--save', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--baseline', default=baseline_path)
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help="allowed slowdown as a fraction, defaults to the baseline's")
+    args = parser.parse_args()
+
+    results = benchmarks()
+    for name, timings in results.items():
+        print(f'{name:>28}: {timings["ops_per_sec"]:>14,.0f} ops/sec {timings["ns_per_call"]:>14,.0f} ns/call '
+              f'{timings["relative"]:>10.2f}x reference')
+
+    if args.save:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump({'python': platform.python_version(),
+                       'machine': platform.machine(),
+                       'tolerance': .25 if args.tolerance is None else args.tolerance,
+                       'results': results}, baseline_file, indent=2, sort_keys=True)
+        print(f'Wrote {args.baseline}')
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}, run with --save to make one.')
+        return
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    tolerance = baseline['tolerance'] if args.tolerance is None else args.tolerance
+    slower = regressions(results, baseline['results'], tolerance)
+    for name, before, after in slower:
+        print(f'REGRESSION {name}: {before:.2f}x -> {after:.2f}x reference ({after / before - 1:+.0%} cost)')
+    if slower:
+        sys.exit(1)
+    print(f'No regressions beyond {tolerance:.0%}.')
+
+
+if __name__ == "__main__":
+    main()
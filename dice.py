@@ -0,0 +1,59 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+import hashlib
+from random import Random, randrange
+
+faces = (1, 2, 3, 4, 5, 6)
+
+
+def game_seed(seed: int, game: int) -> int:
+    """Seed for one game of a series, so every game gets its own stream.
+
+    :param seed: Seed of the series.
+    :param game: Game number in the series.
+    :return: 64 bit seed.
+    """
+    return int.from_bytes(hashlib.sha256(f'{seed}:{game}'.encode()).digest()[:8], 'big')
+
+
+class DiceSource:
+
+    """Seeded stream of die faces, pre-generated in bulk.
+
+    The same seed always rolls the same faces, whatever the roll sizes, so a game can be replayed from its seed.
+
+    """
+
+    def __init__(self, seed: int = None, chunk: int = 1024):
+        """Start the stream.
+
+        :param seed: Seed, random if None.
+        :param chunk: Number of faces generated at a time.
+        """
+        self.seed = randrange(2 ** 64) if seed is None else seed
+        self.chunk = chunk
+        self.rolled = 0
+        self._random = Random(self.seed)
+        self._faces = []
+        self._next = 0
+
+    def roll(self, num_dice: int) -> list:
+        """Roll num_dice dice.
+
+        :param num_dice: Number of dice.
+        :return: List of faces.
+        """
+        end = self._next + num_dice
+        if end > len(self._faces):
+            self._faces = self._faces[self._next:] + self._random.choices(faces, k=max(self.chunk, num_dice))
+            self._next, end = 0, num_dice
+        roll = self._faces[self._next:end]
+        self._next = end
+        self.rolled += num_dice
+        return roll
+
+    __call__ = roll
+
+    def replay(self):
+        """A new source rolling the same faces from the start."""
+        return DiceSource(self.seed, self.chunk)
@@ -0,0 +1,244 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+from collections import deque
+from game_rules import goal, threshold
+from last_chance import last_chance_policy, needed_points
+from logic import Game
+from replay_log import END, KEEP, ROLL, LoggedDice, events, header
+from roll_codes import contains, encode, size
+from score_table import table
+
+
+def bank_points(player) -> None:
+    """Add round_score to total_score, unless the player isn't on the board and it's under threshold.
+
+    :param player: Player ending a turn with a valid basket.
+    """
+    if player.total_score == 0 and player.round_score < threshold:
+        player.round_score = 0
+    player.total_score += player.round_score
+    player.round_score = 0
+
+
+def pass_turn(players: deque, winners: list, current_player, goal: int = goal):
+    """Find whose turn is next.
+
+    Players rotate until someone reaches the goal. From then on, each player who finishes a turn joins winners and
+    isn't put back, so everyone else gets one last chance.
+
+    :param players: Players yet to play, in order. Changed in place.
+    :param winners: Players whose game is over. Changed in place.
+    :param current_player: Player whose turn just ended, or None at the start of a game.
+    :param goal: Total that ends the game.
+    :return: Next player. The game is over once players is empty.
+    """
+    if not any(player.total_score >= goal for player in players):
+        next_player = players.popleft()
+        players.append(next_player)
+    else:
+        winners.append(current_player)
+        next_player = players.popleft()
+    return next_player
+
+
+def leaders(winners: list) -> list:
+    """Players tied for the most points.
+
+    :param winners: Players whose game is over.
+    :return: List of players, more than one for a tie.
+    """
+    best = max(player.total_score for player in winners)
+    return [player for player in winners if player.total_score == best]
+
+
+class GameEngine:
+
+    """A game of Ten Thousand without any widgets.
+
+    Follows the same rules as the game screens: roll, keep scoring dice, roll again or end the turn. Rolling no
+    scoring dice loses the turn's points, keeping all six dice earns a fresh six, points only count once a player
+    banks 500 in one turn, and reaching the goal, 10,000 unless set, gives everyone else one last turn.
+
+    """
+
+    def __init__(self, name_list, dice_source=None, goal: int = goal, turn_limit: int = 0):
+        """Start a game with the first player's turn.
+
+        :param name_list: Player names, in turn order.
+        :param dice_source: DiceSource to roll from, a fresh randomly seeded one if None.
+        :param goal: Total that ends the game, a challenge's points goal for one player.
+        :param turn_limit: Turns a challenge allows, 0 for no limit. Only recorded, the solo screen enforces it.
+        """
+        self.game = Game(name_list, dice_source, goal, turn_limit)
+        self.goal = goal
+        self.turn_limit = turn_limit
+        self.new_game()
+
+    def new_game(self) -> None:
+        """Start over with the same players, from the first player's turn."""
+        for player in self.game.player_list:
+            player.total_score = 0
+            player.round_score = 0
+            player.basket_score = 0
+            player.first_turn = True
+        self.players = deque(self.game.player_list)
+        self.winners = []
+        self.turns = 0
+        self.current_player = None
+        # each game played with these players gets its own record.
+        self.game.new_log()
+        self.start_turn(pass_turn(self.players, self.winners, None, self.goal))
+
+    def start_turn(self, player) -> None:
+        """Hand the dice to player."""
+        self.current_player = player
+        self.game.log.turn(self.game.player_list.index(player))
+        self.dice = 0
+        self.keepers = 0
+        self.old_keepers = 0
+        self.turns += 1
+
+    @property
+    def over(self) -> bool:
+        return not self.players
+
+    @property
+    def dice_left(self) -> int:
+        """Dice the next roll will throw."""
+        return 6 - (self.old_keepers + size(self.keepers)) % 6
+
+    @property
+    def valid_basket(self) -> bool:
+        """True when the turn can go on: before the first roll, or once scoring dice are kept from the last."""
+        return not self.dice or bool(self.keepers and not table[self.keepers].errors)
+
+    @property
+    def turn_points(self) -> int:
+        return self.current_player.round_score + self.current_player.basket_score
+
+    def roll(self) -> int:
+        """Keep the current keepers and roll the rest. A roll with no scoring dice ends the turn.
+
+        :return: Roll code of the dice thrown.
+        """
+        if self.over:
+            raise ValueError('The game is over.')
+        if not self.valid_basket:
+            raise ValueError('Keep scoring dice before rolling again.')
+        player = self.current_player
+        if self.keepers:
+            self.game.log.keep(self.keepers)
+        player.round_score += player.basket_score
+        player.basket_score = 0
+        self.old_keepers = (self.old_keepers + size(self.keepers)) % 6
+        self.keepers = 0
+        self.dice = encode(self.game.dice_source.roll(6 - self.old_keepers))
+        self.game.log.roll(self.dice)
+        if not table[self.dice].keep:
+            self.game.log.farkle()
+            self.end_turn()
+        return self.dice
+
+    def keep(self, dice) -> bool:
+        """Choose the keepers from the last roll, replacing any chosen before.
+
+        :param dice: List of die faces or a roll code, all from the last roll.
+        :return: True if every die kept scores.
+        """
+        keepers = encode(dice)
+        if not contains(self.dice, keepers):
+            raise ValueError('Keepers must come from the last roll.')
+        self.keepers = keepers
+        self.current_player.basket_score = table[keepers].score
+        return self.valid_basket
+
+    def end_turn(self) -> None:
+        """Bank the turn's points if the basket is valid, else lose them, and pass the dice."""
+        player = self.current_player
+        total = player.total_score
+        if self.valid_basket:
+            if self.keepers:
+                self.game.log.keep(self.keepers)
+            player.round_score += player.basket_score
+            bank_points(player)
+        self.game.log.end(player.total_score - total)
+        player.round_score = 0
+        player.basket_score = 0
+        player.first_turn = False
+        next_player = pass_turn(self.players, self.winners, player, self.goal)
+        if self.over:
+            self.current_player = None
+        else:
+            self.start_turn(next_player)
+
+    def should_roll(self, policy) -> bool:
+        """Decide whether the current player rolls on from the dice kept, the way comp_player does.
+
+        :param policy: Turn policy for the current player.
+        :return: False once the first player to reach the goal gets there, else what policy decides.
+        """
+        if not self.winners and self.current_player.total_score + self.turn_points >= self.goal:
+            return False
+        return policy.should_roll(self.turn_points, self.dice_left)
+
+    def play_turn(self, policy) -> list:
+        """Play the current player's turn the way comp_player does.
+
+        The turn policy picks keepers and decides when to bank, except that a player reaching the goal stops, and one
+        on their last chance plays the last chance solver to pass the leader.
+
+        :param policy: Turn policy for the current player.
+        :return: List of (roll code, Keep or None if it farkled) for each roll.
+        """
+        turn = self.turns
+        player = self.current_player
+        if self.winners:
+            leader = max(winner.total_score for winner in self.winners)
+            policy = last_chance_policy(needed_points(player.total_score, leader))
+        moves = []
+        while True:
+            roll = self.roll()
+            if self.over or self.turns != turn:
+                moves.append((roll, None))
+                return moves
+            keep = policy.best_keep(player.round_score, roll)
+            moves.append((roll, keep))
+            self.keep(keep.code)
+            if not self.should_roll(policy):
+                self.end_turn()
+                return moves
+
+    def results(self) -> list:
+        """Players tied for the win, once the game is over."""
+        return leaders(self.winners)
+
+
+def replay(record):
+    """Play a recorded game again through the current rules, without animations.
+
+    Only the rolls and the player's choices are taken from the record. Turn ends, farkles and scores are worked out
+    again, so a record can be re-scored after the rules change.
+
+    :param record: Game record, without its length.
+    :return: The finished GameEngine.
+    """
+    seed, names, points_goal, turn_limit, _ = header(record)
+    dice = LoggedDice(seed)
+    engine = GameEngine(names, dice, points_goal, turn_limit)
+    # the rules may end a turn before the record does.
+    ended = False
+    for kind, value in events(record):
+        if engine.over:
+            break
+        if kind == ROLL and not ended:
+            turn = engine.turns
+            dice.code = value
+            engine.roll()
+            ended = engine.over or engine.turns != turn
+        elif kind == KEEP and not ended:
+            engine.keep(value)
+        elif kind == END:
+            if not ended:
+                engine.end_turn()
+            ended = False
+    return engine
@@ -1,3 +1,8 @@
+# the total that ends the game, once everyone else has had one last turn.
+goal = 10000
+# the fewest points that can be banked before a player is on the board.
+threshold = 500
+
 msg1 = """
 Welcome to Ten Thousand!
 """
@@ -0,0 +1,44 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+"""Roll or bank hints for human players, read off the points maximizing turn policy or the last chance solver."""
+
+from collections import namedtuple
+from functools import lru_cache
+from last_chance import last_chance_policy
+from turn_solver import points_policy, roll_choices
+
+Hint = namedtuple('Hint', 'bust roll_value bank_value keep')
+
+
+@lru_cache(maxsize=4096)
+def hint(points: int, dice_left: int, roll: int, round_score: int = 0, threshold: int = 0) -> Hint:
+    """Work out the odds of rolling on and the best keep from the dice rolled.
+
+    :param points: Turn points if the turn were banked now, kept dice included.
+    :param dice_left: Dice left to roll.
+    :param roll: Code of the dice rolled last, kept or not.
+    :param round_score: Turn points before the last roll.
+    :param threshold: Fewest points that can be banked, 500 before a player is on the board.
+    :return: Hint(bust chance of the next roll, expected points banked by rolling on and by banking now, Keep of the
+        best dice to keep from roll or None if it farkled).
+    """
+    policy = points_policy(threshold)
+    roll_value = sum(probability * policy.value(points + score, next_dice)
+                     for (score, next_dice), probability in policy.moves(points, dice_left) if next_dice)
+    return Hint(roll_choices(dice_left)[0], roll_value, policy.bank(points), policy.best_keep(round_score, roll))
+
+
+@lru_cache(maxsize=4096)
+def last_chance_hint(points: int, dice_left: int, roll: int, round_score: int, target: int) -> Hint:
+    """Work out the odds of passing the leader on a last chance, and the best keep from the dice rolled.
+
+    :param points: Turn points if the turn were banked now, kept dice included.
+    :param dice_left: Dice left to roll.
+    :param roll: Code of the dice rolled last, kept or not.
+    :param round_score: Turn points before the last roll.
+    :param target: Turn points needed to pass the leader.
+    :return: Hint, with the chances of reaching target by rolling on and by banking now in place of expected points.
+    """
+    policy = last_chance_policy(target)
+    return Hint(roll_choices(dice_left)[0], policy.roll_chance(points, dice_left), float(points >= target),
+                policy.best_keep(round_score, roll))
@@ -0,0 +1,31 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+from collections import namedtuple
+from functools import lru_cache
+from roll_codes import encode, size, subsets
+from score_table import table
+
+Keep = namedtuple('Keep', 'code score dice_left')
+
+
+@lru_cache(maxsize=None)
+def _legal_keeps(roll: int) -> tuple:
+    num_dice = size(roll)
+    keeps = []
+    for code in subsets(roll):
+        score, errors = table[code].score, table[code].errors
+        if score and not errors:
+            # keeping every die on the table earns a fresh roll of all six.
+            dice_left = num_dice - size(code) or 6
+            keeps.append(Keep(code, score, dice_left))
+    keeps.sort(key=lambda keep: (-keep.score, -keep.dice_left))
+    return tuple(keeps)
+
+
+def legal_keeps(roll) -> tuple:
+    """List every legal set of scoring dice that can be kept from a roll.
+
+    :param roll: List of die faces or a roll code.
+    :return: Tuple of Keep(code, score, dice_left), highest score first. Empty if the roll farkles.
+    """
+    return _legal_keeps(encode(roll))
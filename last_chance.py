@@ -0,0 +1,130 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+"""Exact play for a last chance turn, where all that matters is passing the leader.
+
+Banking short of the target loses and banking past it wins, so the only choice is which dice to keep. The chance of
+reaching a target doesn't depend on how far past it the table is solved, so every target up to common_limit shares
+one table.
+"""
+
+from functools import lru_cache
+from game_rules import threshold
+from keeps import legal_keeps
+from turn_solver import roll_choices, step
+
+# turn points every last chance target short of this shares one solved table.
+common_limit = 20000
+
+
+@lru_cache(maxsize=None)
+def reach_chances(limit: int) -> tuple:
+    """Best chance to score at least so many more points in a turn, for every target up to limit.
+
+    With a target still to reach, banking never helps, so the only choice is which dice to keep.
+
+    :param limit: Largest target, a multiple of step.
+    :return: chances[dice_left][needed // step], with chances[dice_left][0] == 1.
+    """
+    top = limit // step
+    chances = [None] + [[1.] + [0.] * top for _ in range(6)]
+    choices = [None] + [roll_choices(num_dice) for num_dice in range(1, 7)]
+    for needed in range(1, top + 1):
+        for num_dice in range(1, 7):
+            chance = 0.
+            for probability, options in choices[num_dice][1]:
+                chance += probability * max(chances[dice_left][max(needed - steps, 0)]
+                                            for steps, dice_left in options)
+            chances[num_dice][needed] = chance
+    return chances
+
+
+def reach_chance(needed: int, dice_left: int = 6) -> float:
+    """Best chance to score at least needed more points this turn.
+
+    :param needed: Points still to score.
+    :param dice_left: Dice left to roll.
+    :return: Probability.
+    """
+    if needed <= 0:
+        return 1.
+    steps = -(-needed // step)
+    return reach_chances(max(common_limit, steps * step))[dice_left][steps]
+
+
+def needed_points(total: int, leader: int) -> int:
+    """Fewest turn points taking a player with total past leader.
+
+    :param total: Player's total.
+    :param leader: Highest total of the players who have reached the goal.
+    :return: Turn points, at least 500 for a player not yet on the board.
+    """
+    needed = leader - total + step
+    if not total:
+        needed = max(needed, threshold)
+    return needed
+
+
+class LastChancePolicy:
+
+    """Best play for a turn that has to reach a target number of turn points.
+
+    """
+
+    def __init__(self, target: int):
+        """Set the target.
+
+        :param target: Turn points to reach.
+        """
+        self.target = target
+        self.best_keep = lru_cache(maxsize=4096)(self.best_keep)
+
+    def chance(self, points: int, dice_left: int) -> float:
+        """Chance of reaching the target from a state under best play.
+
+        :param points: Turn points so far.
+        :param dice_left: Dice left to roll.
+        :return: Probability.
+        """
+        return reach_chance(self.target - points, dice_left)
+
+    def roll_chance(self, points: int, dice_left: int) -> float:
+        """Chance of reaching the target by rolling again, even if it's been reached already.
+
+        :param points: Turn points so far.
+        :param dice_left: Dice left to roll.
+        :return: Probability.
+        """
+        if points >= self.target:
+            return 1. - roll_choices(dice_left)[0]
+        return self.chance(points, dice_left)
+
+    def should_roll(self, points: int, dice_left: int) -> bool:
+        """Roll until the target is reached.
+
+        :param points: Turn points so far.
+        :param dice_left: Dice left to roll.
+        :return: True to roll, False to bank.
+        """
+        return points < self.target
+
+    def best_keep(self, points: int, roll: int):
+        """Choose the dice to keep from a roll.
+
+        :param points: Turn points before this roll.
+        :param roll: Roll code.
+        :return: The Keep most likely to reach the target, or None if the roll farkles.
+        """
+        keeps = legal_keeps(roll)
+        if not keeps:
+            return None
+        return max(keeps, key=lambda keep: self.chance(points + keep.score, keep.dice_left))
+
+
+@lru_cache(maxsize=256)
+def last_chance_policy(target: int) -> LastChancePolicy:
+    """Policy for reaching target turn points.
+
+    :param target: Turn points to reach, like needed_points gives.
+    :return: A LastChancePolicy.
+    """
+    return LastChancePolicy(target)
@@ -1,7 +1,11 @@
 # Copyright 2018 Paul Kutrich. All rights reserved.
 
-from collections import Counter
-from scoring_rules import scoring_rules
+from dice import DiceSource
+from game_rules import goal
+from keeps import legal_keeps
+from replay_log import GameLog
+from roll_codes import encode, to_counts
+from score_table import table
 
 
 class Game:
@@ -13,13 +17,28 @@ class Game:
 
     """
 
-    def __init__(self, name_list):
+    def __init__(self, name_list, dice_source=None, goal: int = goal, turn_limit: int = 0):
         """Begins Game by creating list of Player objects.
 
         Calls Game.set_player.
+
+        :param name_list: Player names.
+        :param dice_source: DiceSource the game rolls from, a fresh randomly seeded one if None.
+        :param goal: Total that ends the game, recorded in the log.
+        :param turn_limit: Turns a challenge allows, 0 for no limit, recorded in the log.
         """
+        self.dice_source = dice_source or DiceSource()
+        self.goal = goal
+        self.turn_limit = turn_limit
         self.player_list = []
         self.set_player(name_list)
+        self.new_log()
+
+    def new_log(self) -> GameLog:
+        """Start a fresh record of the game, for a game played again with the same players."""
+        self.log = GameLog([player.name for player in self.player_list], self.dice_source.seed, self.goal,
+                           self.turn_limit)
+        return self.log
 
     def set_player(self, name_list):
         """Sets number of players and player names. Adds computer player if desired.
@@ -34,79 +53,67 @@ class Game:
 
     @staticmethod
     def is_three_pair(choice):
-        choice = sorted(choice)
-        return (len(choice) == 6 and
-                choice[0] == choice[1] and
-                choice[2] == choice[3] and
-                choice[4] == choice[5] and
-                (choice[0] != choice[2] and choice[0] != choice[4]) and
-                choice[2] != choice[4])
+        return table[encode(choice)].three_pair
 
     @staticmethod
     def is_straight(choice):
-        return sorted(choice) == list(range(1, 7))
+        return table[encode(choice)].straight
 
     def keep_score(self, choice):
         """Scores choices from choose_dice() according to scoring_rules.
 
         Ensures highest legal score is used.
-        Player informed of end of turn if score is zero.
 
-        :param choice: List of dice chosen from Player.choose_dice.
+        :param choice: List of dice chosen from Player.choose_dice, or their roll code.
         :return: integer score
         """
-        counts = Counter(choice)
-        score = sum(scoring_rules[die - 1][count - 1]
-                    for die, count in counts.items())
-        if score < 1500:
-            if self.is_straight(choice) or self.is_three_pair(choice):
-                score = 1500
-        elif score == 0:
-            print('\nSorry, no keepers. That ends your turn.'
-                  '\nYour score for this round is: 0')
-            return 0
-        return score
+        return table[encode(choice)].score
 
     def validate_choice(self, choice):
         """Removes errant choices and informs user of error(s) if present.
 
-        :param choice: List. User choices before validating
-        :return: List. User choices sans errors."""
-        counts = Counter(choice)
-        if Game.is_three_pair(choice) and \
-                sum(scoring_rules[die - 1][count - 1]
-                    for die, count in counts.items()) < 1500:
-            return []
-        if Game.is_straight(choice):
-            return []
-        else:
-            errors = []
-            for die, count in counts.items():
-                if (scoring_rules[die - 1][count - 1] == 0 and not
-                        Game.is_straight(choice) and not
-                        Game.is_three_pair(choice)):
-                    errors.append(die)
-        return errors
+        :param choice: List or roll code. User choices before validating
+        :return: List. User choices sans errors, in the order they were chosen."""
+        errors = table[encode(choice)].errors
+        if isinstance(choice, int) or len(errors) < 2:
+            return list(errors)
+        return sorted(errors, key=list(choice).index)
 
     def choose_dice(self, roll):
         """Choose dice according to scoring rules. Boop Beep.
 
-        :param roll: List. Dice to choose from.
-        :return: List. Dice chosen.
+        :param roll: List of DieScatter, or a roll code. Dice to choose from.
+        :return: List of DieScatter, or a roll code. Dice chosen.
+        """
+        if isinstance(roll, int):
+            return table[roll].keep
+        kept = to_counts(table[encode(int(die.id) for die in roll)].keep)
+        return [die for die in roll if kept[int(die.id) - 1]]
+
+    @staticmethod
+    def legal_keeps(roll):
+        """Every way to keep scoring dice from a roll, not only the one choose_dice picks.
+
+        :param roll: List of die faces or a roll code.
+        :return: Tuple of Keep(code, score, dice_left), highest score first.
+        """
+        return legal_keeps(roll)
+
+    @staticmethod
+    def pick_dice(roll, code):
+        """Find the dice in a roll making up a roll code.
+
+        :param roll: List of DieScatter.
+        :param code: Roll code of the dice wanted.
+        :return: List of DieScatter.
         """
-        nums = [int(die.id) for die in roll]
-        counts = Counter(nums)
-        if Game.is_three_pair(nums) and \
-                sum(scoring_rules[die - 1][count - 1]
-                    for die, count in counts.items()) < 1500:
-            choice = roll
-        elif Game.is_straight(nums):
-            choice = roll
-        else:
-            temp = [die for die, count in counts.items() for _ in range(count)
-                    if scoring_rules[die - 1][count - 1] > 0]
-            choice = [die for die in roll if int(die.id) in temp]
-        return choice
+        wanted = list(to_counts(code))
+        chosen = []
+        for die in roll:
+            if wanted[int(die.id) - 1]:
+                wanted[int(die.id) - 1] -= 1
+                chosen.append(die)
+        return chosen
 
 
 class Player(object):
@@ -128,6 +135,8 @@ class Player(object):
         self.score_display = None
         self.info = None
         self.comp_player = False
+        self.hard_mode = False
+        self.turbo = False
         self.first_turn = True
 
 
@@ -1,14 +1,17 @@
 # Copyright 2018 Paul Kutrich. All rights reserved.
+import startup
 import kivy
 
 kivy.require('1.10.1')
 
 from kivy.animation import Animation
 from kivy.app import App
-from kivy.clock import Clock
+from kivy.clock import Clock, mainthread
+from kivy.logger import Logger
+from kivy.core.text import Label as CoreLabel
 from kivy.core.window import Window
 from kivy.graphics import Rectangle, Color, InstructionGroup
-from kivy.properties import ObjectProperty, StringProperty, ListProperty, NumericProperty
+from kivy.properties import ObjectProperty, StringProperty, ListProperty, NumericProperty, BooleanProperty
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.dropdown import DropDown
@@ -22,26 +25,171 @@ from kivy.uix.textinput import TextInput
 from kivy.utils import rgba
 from kivy.uix.widget import Widget
 
+import os
+import sys
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from colors import colors
-from game_rules import msg1, msg2
-from logic import Game
-from media import sounds, die_images
-from random import randint, uniform
+from engine import GameEngine
+from game_rules import msg1, msg2, threshold
+from hints import hint, last_chance_hint
+from last_chance import common_limit, last_chance_policy, needed_points, reach_chances
+from media import sounds, die_images, die_textures, preload_textures
+from random import randint, shuffle, uniform
+from roll_codes import decode
+from solo_odds import success_chance, table_covers
+from turn_solver import TurnPolicy, points_policy
+from win_solver import win_table
+
+startup.mark('imports')
+
+
+# font sizes set_text_to_fit tries, as fractions of widget height, largest first.
+font_scales = tuple((15 - i) / 20 for i in range(7))
+
+
+@lru_cache(maxsize=4096)
+def fit_font_scale(text: str, font_name: str, bold: bool, italic: bool, padding: float, width: float,
+                   height: float) -> float:
+    """Binary search font_scales for the largest font that fits text across width.
+
+    Text is measured without rendering it, and results are cached since the same texts are fitted to the same
+    widgets over and over.
+
+    :return: Fraction of height to use as font size.
+    """
+    if not text:
+        return font_scales[0]
+    lines = text.split('\n')
+
+    def fits(scale: float) -> bool:
+        label = CoreLabel(font_size=height * scale, font_name=font_name, bold=bold, italic=italic)
+        return max(label.get_extents(line)[0] for line in lines) + 2 * padding <= width
+
+    low, high = 0, len(font_scales) - 1
+    while low < high:
+        middle = (low + high) // 2
+        if fits(font_scales[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    return font_scales[low]
+
+
+def fitted_font_size(widget: Widget) -> float:
+    """Largest font size from font_scales fitting widget's text across its width."""
+    return widget.height * fit_font_scale(widget.text, widget.font_name, widget.bold, widget.italic,
+                                          widget.padding[0], widget.width, widget.height)
 
 
 def set_text_to_fit(widget: Widget) -> None:
     """Adjust text size to fit widget size for any screen size.
 
-    :param widget: A widget with texture_size attribute.
+    :param widget: A Label or Button.
     """
-    m = .75
-    widget.font_size = widget.height * m
-    widget.texture_update()
-    while m > 0.45 and widget.texture_size[0] > widget.width:
-        m -= 0.05
-        widget.font_size = widget.height * m
-        widget.texture_update()
+    widget.font_size = fitted_font_size(widget)
+
+
+def set_group_text_to_fit(widgets) -> None:
+    """Give widgets the same font size, the largest fitting all of them.
+
+    :param widgets: Labels or Buttons.
+    """
+    widgets = list(widgets)
+    if widgets:
+        font_size = min(fitted_font_size(widget) for widget in widgets)
+        for widget in widgets:
+            widget.font_size = font_size
+
+
+def game_log_path() -> str:
+    """File finished games are appended to, in the app's data directory."""
+    return os.path.join(App.get_running_app().user_data_dir, 'games.log')
+
+
+def solve_policies() -> None:
+    """Solve the turn policies comp_player and the hints read from, about a second the first time."""
+    points_policy(0)
+    points_policy(threshold)
+    reach_chances(common_limit)
+
+
+class Sequence:
+    """Runs steps one after another, each starting once the animations the step before it started are complete.
+
+    A step is a function returning the Animations it started, one per widget animated, or None if it's done at once.
+    """
+
+    def __init__(self, *steps) -> None:
+        self.steps = deque(steps)
+        self.pending = 0
+        self.cancelled = False
+
+    def start(self, *args: list) -> 'Sequence':
+        """Run the first step.
+
+        :param args: Unused.
+        :return: self, for keeping a handle to cancel.
+        """
+        self.next_step()
+        return self
+
+    def cancel(self) -> None:
+        """Run no more steps."""
+        self.cancelled = True
+        self.steps.clear()
+
+    def next_step(self, *args: list) -> None:
+        if self.cancelled or not self.steps:
+            return
+        animations = self.steps.popleft()()
+        if isinstance(animations, Animation):
+            animations = [animations]
+        animations = [animation for animation in animations or [] if animation]
+        if not animations:
+            self.next_step()
+            return
+        self.pending = len(animations)
+        for animation in animations:
+            # kivy holds bound methods weakly, the closure keeps the sequence alive while it waits.
+            animation.bind(on_complete=lambda *args: self.step_done())
+
+    def step_done(self) -> None:
+        self.pending -= 1
+        if not self.pending:
+            # let the animations' other on_complete handlers finish first.
+            Clock.schedule_once(self.next_step)
+
+
+class Decision:
+    """A slow decision worked out on the thinker thread, then acted on back on the main thread.
+
+    Keeps the frame rate up while a strong comp_player thinks or a challenge's odds are solved.
+    """
+
+    thinker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='thinker')
+
+    def __init__(self, think, act) -> None:
+        """Start thinking.
+
+        :param think: Function returning the decision, called on the thinker thread.
+        :param act: Function of the decision, called on the main thread.
+        """
+        self.act = act
+        self.cancelled = False
+        self.future = self.thinker.submit(think)
+        self.future.add_done_callback(self.deliver)
+
+    def cancel(self) -> None:
+        """Never act on the decision. If it's being worked out already it runs to the end and is thrown away."""
+        self.cancelled = True
+        self.future.cancel()
+
+    @mainthread
+    def deliver(self, future) -> None:
+        if not self.cancelled:
+            self.act(future.result())
 
 
 class MenuScreen(Screen):
@@ -60,7 +208,8 @@ class MenuScreen(Screen):
         :param args:
         """
         for widget in self.children:
-            set_text_to_fit(widget)
+            if isinstance(widget, (Label, Button)):
+                set_text_to_fit(widget)
 
     def on_pre_enter(self) -> None:
         """Call set_text_size when entering screen."""
@@ -95,7 +244,7 @@ class MyOwnSelfButton(Button):
 
     def on_release(self) -> None:
         """Set number of players and schedule move to PlayerNameScreen."""
-        name_screen = next(screen for screen in self.parent.parent.screens if screen.name == 'name')
+        name_screen = self.parent.parent.get_screen('name')
         name_screen.game_mode = 'comp'
         name_screen.num_players = 2
         Clock.schedule_once(self.to_name_screen, .05)
@@ -114,10 +263,10 @@ class SoloGameButton(Button):
 
     def on_release(self) -> None:
         """Set number of players, game mode and schedule move to PlayerGoalScreen."""
-        screens = self.parent.parent.screens
-        number_screen = next(screen for screen in screens if screen.name == 'number')
+        screen_manager = self.parent.parent
+        number_screen = screen_manager.get_screen('number')
         number_screen.num_players = 1
-        name_screen = next(screen for screen in screens if screen.name == 'name')
+        name_screen = screen_manager.get_screen('name')
         name_screen.game_mode = 'solo'
         name_screen.num_players = 1
         Clock.schedule_once(self.to_goal_screen, .2)
@@ -150,7 +299,8 @@ class PlayerNumberScreen(Screen):
 
     def set_text_size(self, *args) -> None:
         for widget in self.children:
-            set_text_to_fit(widget)
+            if isinstance(widget, (Label, Button)):
+                set_text_to_fit(widget)
 
     def setup_buttons(self, *args) -> None:
         # Make a player_num_button.
@@ -231,14 +381,14 @@ class PlayerNumberScreen(Screen):
         set_text_to_fit(self.cont)
 
     def to_name_screen(self) -> None:
-        name_screen = next(screen for screen in self.parent.screens if screen.name == 'name')
+        name_screen = self.parent.get_screen('name')
         name_screen.num_players = self.num_players
         name_screen.game_mode = self.game_mode
         self.parent.current = 'name'
 
     def to_menu_screen(self) -> None:
         """Reset PlayerNameScreen, PlayerNumberScreen and go to MenuScreen."""
-        name_screen = next(screen for screen in self.parent.screens if screen.name == 'name')
+        name_screen = self.parent.get_screen('name')
         name_screen.game_mode = 'game'
         self.num_label.text = 'Players Selected: '
         self.cont.disabled = True
@@ -282,9 +432,11 @@ class PlayerNameScreen(Screen):
     """
 
     player_names = ListProperty()
-    active_game = ObjectProperty()
+    engine = ObjectProperty()
     num_players = NumericProperty()
     game_mode = StringProperty()
+    hard_mode = BooleanProperty(False)
+    turbo = BooleanProperty(False)
 
     def on_pre_enter(self) -> None:
         """Set up screen with widgets for entering player names."""
@@ -308,8 +460,50 @@ class PlayerNameScreen(Screen):
 
             input_name = (FocusInput(pos_hint={'x': .475, 'y': .715 + (self.num_players / 30) - (i * .135)}))
             self.add_widget(input_name)
+
+        # a hard computer plays from the win table, if it has been built.
+        if self.game_mode == 'comp' and self.num_players == 2 and win_table():
+            hard_button = MyButton(text=self.hard_button_text(),
+                                   id='hard',
+                                   font_size=75,
+                                   size_hint=(.3, .075),
+                                   pos_hint={'x': .18, 'y': .05})
+            hard_button.bind(on_release=self.toggle_hard_mode)
+            self.add_widget(hard_button)
+        if self.game_mode == 'comp':
+            speed_button = MyButton(text=self.speed_button_text(),
+                                    id='speed',
+                                    font_size=75,
+                                    size_hint=(.3, .075),
+                                    pos_hint={'x': .52, 'y': .05})
+            speed_button.bind(on_release=self.toggle_turbo)
+            self.add_widget(speed_button)
         Clock.schedule_once(self.set_text_size, .01)
 
+    def hard_button_text(self) -> str:
+        return 'COMPUTER: HARD' if self.hard_mode else 'COMPUTER: NORMAL'
+
+    def toggle_hard_mode(self, button: Button) -> None:
+        """Switch the computer player between normal and hard.
+
+        :param button: The hard mode button.
+        """
+        self.hard_mode = not self.hard_mode
+        button.text = self.hard_button_text()
+        set_text_to_fit(button)
+
+    def speed_button_text(self) -> str:
+        return 'SPEED: TURBO' if self.turbo else 'SPEED: NORMAL'
+
+    def toggle_turbo(self, button: Button) -> None:
+        """Switch the computer player between animated turns and turbo turns.
+
+        :param button: The speed button.
+        """
+        self.turbo = not self.turbo
+        button.text = self.speed_button_text()
+        set_text_to_fit(button)
+
     def set_text_size(self, *args) -> None:
         for widget in self.children:
             if isinstance(widget, (Label, Button)):
@@ -329,25 +523,34 @@ class PlayerNameScreen(Screen):
                 self.start_game()
 
     def start_game(self) -> None:
-        """Instantiate a Game. Make a comp_player if needed. Go to correct game screen."""
-        self.active_game = Game(self.player_names)
+        """Instantiate a GameEngine. Make a comp_player if needed. Go to correct game screen."""
+        if self.game_mode == 'solo':
+            # a challenge is over once its points goal is reached.
+            solo_screen = self.parent.get_screen('solo')
+            self.engine = GameEngine(self.player_names, goal=solo_screen.point_goal, turn_limit=solo_screen.turn_limit)
+        else:
+            self.engine = GameEngine(self.player_names)
 
         if self.game_mode == 'comp':
-            self.active_game.player_list[-1].comp_player = True
+            self.engine.game.player_list[-1].comp_player = True
+            self.engine.game.player_list[-1].hard_mode = self.hard_mode
+            self.engine.game.player_list[-1].turbo = self.turbo
+            # solve comp_player's turn policies on the thinker thread, ahead of its first decision there.
+            Decision(solve_policies, lambda _: None)
 
         if self.game_mode == 'game' or self.game_mode == 'comp':
-            game_screen = next(screen for screen in self.parent.screens if screen.name == 'game')
-            game_screen.base.active_game = self.active_game
+            game_screen = self.parent.get_screen('game')
+            game_screen.base.engine = self.engine
             self.parent.current = 'game'
 
         elif self.game_mode == 'solo':
-            solo_screen = next(screen for screen in self.parent.screens if screen.name == 'solo')
-            solo_screen.base.active_game = self.active_game
+            solo_screen = self.parent.get_screen('solo')
+            solo_screen.base.engine = self.engine
             self.parent.current = 'solo'
 
     def reset_goal_screen(self) -> None:
         """Reset goal_screen variables and labels."""
-        goal_screen = next(screen for screen in self.parent.screens if screen.name == 'goal')
+        goal_screen = self.parent.get_screen('goal')
         goal_screen.turn_limit = 0
         goal_screen.point_goal = 0
         goal_screen.goals.diff.text = 'Difficulty:'
@@ -356,7 +559,7 @@ class PlayerNameScreen(Screen):
 
     def reset_num_screen(self) -> None:
         """Reset number_screen variables, labels, and buttons."""
-        number_screen = next(screen for screen in self.parent.screens if screen.name == 'number')
+        number_screen = self.parent.get_screen('number')
         number_screen.num_label.text = 'Players Selected: '
         number_screen.cont.disabled = True
         number_screen.game_mode = 'game'
@@ -396,24 +599,29 @@ class GameScreen(Screen):
     """
 
     base = ObjectProperty()
+    # the decision comp_player is working out, the keepers it's moving and the (Animation, label) summing up a
+    # turbo turn, dropped if the game is left.
+    overlord_decision = None
+    overlord_moves = None
+    overlord_summary = None
 
     def on_pre_enter(self, *args: list) -> None:
         """Set up screen for start of game.
 
-        Call get_active_game and get_active_game_players. Instantiate PlayerScore widgets.
+        Add player totals. Instantiate PlayerScore widgets.
         Start game by calling next_round.
 
         :param args: Unused.
         """
-        self.base.get_active_game_players()
+        self.base.info.add_player_totals()
 
-        for player in self.base.list_o_players:
+        for player in self.base.engine.game.player_list:
             player_score = PlayerScore(id=player.name,
                                        pos=(self.base.score_area.x, self.base.top + 10))
             player_score.name.text = player.name.title()
             player.score_display = player_score
 
-        first_player = self.base.list_o_players[0].score_display
+        first_player = self.base.engine.current_player.score_display
         self.base.score_area.add_widget(first_player)
         self.next_round()
 
@@ -441,86 +649,118 @@ class GameScreen(Screen):
         Clock.schedule_once(popup.dismiss, 4.5)
 
     def next_round(self, *args: list) -> None:
-        """Get a player if there is none else call reset_round and animate_score_out.
+        """Show the first turn if there is none shown, else end the turn, call reset_round and animate_score_out.
 
         :param args: Unused.
         :return: None.
         """
         if not self.base.current_player or self.base.current_player.name == '':
-            temp = self.base.list_o_players.popleft()
-            self.base.current_player = temp
+            self.base.show_turn()
             if self.base.current_player.first_turn and not self.base.current_player.comp_player:
                 self.open_first_popup(self.base.current_player)
 
-            self.base.list_o_players.append(temp)
-
             Clock.schedule_once(self.animate_indicator, 1)
             Clock.schedule_once(self.base.set_score_text_size, .0001)
             return None
 
+        self.base.end_turn()
         self.reset_round()
         self.animate_score_out()
 
     def get_next_player(self) -> None:
-        """Pop next player from list_o_players.
+        """Show the turn engine passed the dice to, or the results once the game is over.
 
-        If we have a winner, put players in list_o_winners instead of back into list_o_players.
         Keep comp_player turns moving, schedule roll.on_release.
         """
-        if not any([player.total_score >= 10000 for player in self.base.list_o_players]):
-            temp = self.base.list_o_players.popleft()
-            self.base.current_player = temp
-            if self.base.current_player.first_turn and not self.base.current_player.comp_player:
-                self.open_first_popup(self.base.current_player)
-            self.base.list_o_players.append(temp)
-            if self.base.current_player.comp_player:
-                Clock.schedule_once(self.base.buttons.roll.on_release, 1.)
-
-        else:
-            self.base.list_o_winners.append(self.base.current_player)
-            self.base.current_player = self.base.list_o_players.popleft()
-            if self.base.list_o_players and self.base.current_player.comp_player:
-                Clock.schedule_once(self.base.buttons.roll.on_release, 1.)
-            if self.base.list_o_players and not self.base.current_player.comp_player:
-                self.open_last_popup()
-
-        if not self.base.list_o_players:
+        if self.base.engine.over:
             self.find_winner()
+            return None
+
+        self.base.show_turn()
+        if self.base.current_player.comp_player:
+            Clock.schedule_once(self.base.buttons.roll.on_release, 1.)
+        elif self.base.engine.winners:
+            self.open_last_popup()
+        elif self.base.current_player.first_turn:
+            self.open_first_popup(self.base.current_player)
 
     def find_winner(self) -> None:
-        """Sort list_o_winners, pick the appropriate message, go to ResultsScreen."""
-        winners = sorted(self.base.list_o_winners, key=lambda player: player.total_score, reverse=True)
-        tie = [winners[0]] + [winner for winner in winners[1:] if winner.total_score == winners[0].total_score]
+        """Find the leaders, pick the appropriate message, go to ResultsScreen."""
+        tie = self.base.engine.results()
 
         if len(tie) > 1:
             names = [win.name.title() for win in tie]
             ties = ' and '.join(names)
             message = f'It\'s a Tie!\n{ties}\n' \
-                f'Win with {winners[0].total_score:,} points!'
+                f'Win with {tie[0].total_score:,} points!'
         else:
-            message = f'{winners[0].name.title()} Wins!\n\nWith {winners[0].total_score:,} points!'
+            message = f'{tie[0].name.title()} Wins!\n\nWith {tie[0].total_score:,} points!'
 
-        results_screen = next(screen for screen in self.parent.screens if screen.name == 'results')
+        self.base.engine.game.log.save(game_log_path())
+        results_screen = self.parent.get_screen('results')
         results_screen.message = message
         results_screen.game_mode = 'game'
 
         Clock.schedule_once(self.to_results_screen, .5)
 
+    def overlord_policy(self) -> TurnPolicy:
+        """Get the solved turn policy for comp_player.
+
+        On its last chance comp_player plays to pass the leader. A hard comp_player plays to beat its strongest
+        opponent while nobody has reached the goal. Otherwise it plays for points, and can't bank under 500 points
+        until on the board.
+        """
+        current_player = self.base.current_player
+        engine = self.base.engine
+        if engine.winners:
+            leader = max(player.total_score for player in engine.winners)
+            return last_chance_policy(needed_points(current_player.total_score, leader))
+        table = win_table()
+        if current_player.hard_mode and table and not engine.winners:
+            theirs = max(player.total_score for player in engine.players if player is not current_player)
+            if current_player.total_score < table.goal and theirs < table.goal:
+                return table.turn_policy(current_player.total_score, theirs)
+        return points_policy(0 if current_player.total_score else threshold)
+
+    def cancel_overlord(self) -> None:
+        """Drop comp_player's decision in flight, stop moving its keepers and showing its turn summary, and forget
+        the move it scheduled.
+        """
+        for pending in (self.overlord_decision, self.overlord_moves):
+            if pending:
+                pending.cancel()
+        if self.overlord_summary:
+            anim, summary = self.overlord_summary
+            anim.cancel(summary)
+            self.base.remove_widget(summary)
+        self.overlord_decision = self.overlord_moves = self.overlord_summary = None
+        Clock.unschedule(self.base.buttons.roll.on_release)
+        Clock.unschedule(self.base.buttons.end_turn.on_release)
+
     def continue_overlord_turn(self) -> None:
-        """See if there are any keepers and keep them, else end the turn."""
-        scoring_dice = [die for die in self.base.active_game.choose_dice(
-            [die for die in self.base.dice.children if die not in self.base.die_basket.old_keepers])]
+        """Have the turn policy pick dice to keep, off the main thread."""
+        roll = [die for die in self.base.dice.children if die not in self.base.die_basket.old_keepers]
+        round_score = self.base.current_player.round_score
+        code = self.base.engine.dice
+        self.overlord_decision = Decision(lambda: self.overlord_policy().best_keep(round_score, code),
+                                          partial(self.keep_overlord_dice, roll))
+
+    def keep_overlord_dice(self, roll: list, keep) -> None:
+        """Keep the dice the turn policy picked, else end the turn.
 
-        if not scoring_dice:
+        :param roll: DieScatter objects rolled.
+        :param keep: Score of the dice to keep, or None.
+        """
+        if not keep:
             Clock.schedule_once(self.base.buttons.end_turn.on_release, .5)
             return
 
         else:
-            # delay continuing the turn until all dice animations are complete.
-            Clock.schedule_once(self.overlord_status_check, float(len(scoring_dice)))
-            for i, die in enumerate(scoring_dice):
-                # delay first animation by .8sec.
-                Clock.schedule_once(die.add_to_keepers, i * .85 + .8)
+            scoring_dice = self.base.engine.game.pick_dice(roll, keep.code)
+            # wait for the roll to land, move each keeper once the last is in place, then carry on.
+            self.overlord_moves = Sequence(lambda: self.base.dice.rolling,
+                                           *(die.add_to_keepers for die in scoring_dice),
+                                           self.overlord_status_check).start()
 
     def overlord_status_check(self, *args: list) -> None:
         """Determine if comp_player should roll again.
@@ -528,54 +768,73 @@ class GameScreen(Screen):
         :param args: Unused.
         :return: None
         """
-        winners = sorted(self.base.list_o_winners, key=lambda player: player.total_score, reverse=True)
+        engine = self.base.engine
+        # roll if it's worth more than banking what we've got, or until past the leader on a last chance.
+        self.overlord_decision = Decision(lambda: engine.should_roll(self.overlord_policy()), self.overlord_move)
 
-        # if comp_player has six keepers, roll again.
-        if len(self.base.die_basket.old_keepers) + len(self.base.die_basket.keepers) >= 6:
-            Clock.schedule_once(self.base.buttons.roll.on_release, 1.)
-            return
+    def overlord_move(self, rolling: bool) -> None:
+        """Roll again or end comp_player's turn.
 
-        # there's already a winner, keep rolling.
-        elif winners and winners[0].total_score >= (self.base.current_player.total_score +
-                                                    self.base.current_player.round_score +
-                                                    self.base.current_player.basket_score):
+        :param rolling: True to roll.
+        """
+        if rolling:
             Clock.schedule_once(self.base.buttons.roll.on_release, 1.)
-            return
-
-        # comp_player has the winning score, stop!
-        elif winners and (self.base.current_player.total_score +
-                          self.base.current_player.round_score +
-                          self.base.current_player.basket_score) > winners[0].total_score:
+        else:
             Clock.schedule_once(self.base.buttons.end_turn.on_release, 1.)
-            return
 
-        # comp_player is the first to reach the goal, stop!
-        elif not winners and (self.base.current_player.total_score +
-                              self.base.current_player.round_score +
-                              self.base.current_player.basket_score) >= 10000:
-            Clock.schedule_once(self.base.buttons.end_turn.on_release, 1.)
-            return
+    def play_turbo_turn(self) -> None:
+        """Play comp_player's whole turn at once through engine off the main thread, then show how it went."""
+        engine = self.base.engine
+        self.overlord_decision = Decision(lambda: engine.play_turn(self.overlord_policy()), self.finish_turbo_turn)
 
-        # comp_player has 500 or more points and three or fewer dice to roll. Pretty good, stop.
-        elif (self.base.current_player.round_score + self.base.current_player.basket_score >= 500 and
-              len(self.base.die_basket.old_keepers) + len(self.base.die_basket.keepers) >= 3):
-            Clock.schedule_once(self.base.buttons.end_turn.on_release, 1.)
-            return
+    def finish_turbo_turn(self, moves: list) -> None:
+        """Show how the turn engine played went.
 
-        # whelp, I suppose we'd better roll 'em.
+        :param moves: List of (roll code, Keep or None) returned by GameEngine.play_turn.
+        """
+        current_player = self.base.current_player
+        if moves[-1][1]:
+            points = sum(keep.score for roll, keep in moves)
+            message = f'{current_player.name.title()} keeps\n{points:,} points!'
         else:
-            Clock.schedule_once(self.base.buttons.roll.on_release, 1.)
+            self.base.die_basket.valid_basket = rgba(colors['error'])
+            message = f'{current_player.name.title()} Farkled\nafter {len(moves)} rolls!'
+
+        self.base.update_display('total')
+        self.show_turn_summary(message)
+
+    def show_turn_summary(self, message: str) -> None:
+        """Fade message in and out over the table, then end the turn.
+
+        :param message: What happened this turn.
+        """
+        summary = MyLabel(text=message,
+                          color=rgba(colors['text']),
+                          halign='center',
+                          size_hint=(.5, .2),
+                          pos_hint={'x': .25, 'y': .45},
+                          opacity=0)
+        self.base.add_widget(summary)
+        Clock.schedule_once(lambda dt: set_text_to_fit(summary), 0)
+        anim = Animation(opacity=1, d=.3) + Animation(d=.9) + Animation(opacity=0, d=.3)
+        anim.bind(on_complete=lambda animation, widget: self.end_turbo_turn(widget))
+        anim.start(summary)
+        self.overlord_summary = (anim, summary)
+
+    def end_turbo_turn(self, summary: Label) -> None:
+        # the game was left while the summary showed.
+        if not self.overlord_summary or self.overlord_summary[1] is not summary:
             return
+        self.overlord_summary = None
+        self.base.remove_widget(summary)
+        self.next_round()
 
     def reset_round(self) -> None:
         """Restore all base objects to initial state."""
-        self.base.update_round_score(green_line=True)
-        self.base.update_total_score()
         self.base.die_basket.valid_basket = rgba(colors['valid'])
         self.base.buttons.roll.update_color()
         self.base.buttons.roll.text = 'ROLL \'EM!'
         set_text_to_fit(self.base.buttons.roll)
-        self.base.current_player.round_score = 0
         self.base.die_basket.keepers.clear()
         self.base.die_basket.old_keepers.clear()
         self.base.dice.remove_dice(self.base.dice.children)
@@ -707,28 +966,18 @@ class ResultsScreen(Screen):
 
         self.parent.current = 'menu'
 
-    def reset_player_scores(self, screen: Screen) -> None:
-        """Set all scores to zero.
-
-        :param screen: A game screen.
-        """
-        for player in screen.base.active_game.player_list:
-            player.total_score = 0
-            player.round_score = 0
-            player.basket_score = 0
-            player.first_turn = True
-
     def play_again(self) -> None:
-        """Reset player scores and return to appropriate game screen."""
-        game_screen = next(screen for screen in self.parent.screens if screen.name == 'game')
+        """Start the game over with the same players and return to appropriate game screen."""
+        game_screen = self.parent.get_screen('game')
+        game_screen.cancel_overlord()
 
         if self.game_mode == 'solo':
-            solo_screen = next(screen for screen in self.parent.screens if screen.name == 'solo')
-            self.reset_player_scores(solo_screen)
+            solo_screen = self.parent.get_screen('solo')
+            solo_screen.base.engine.new_game()
             self.reset_solo_screen(solo_screen)
 
         else:
-            self.reset_player_scores(game_screen)
+            game_screen.base.engine.new_game()
             self.reset_game_screen(game_screen)
 
         self.parent.current = self.game_mode
@@ -751,9 +1000,11 @@ class ResultsScreen(Screen):
         :param name_screen: PlayerNameScreen instance.
         """
         name_screen.player_names.clear()
-        name_screen.active_game = ObjectProperty()
+        name_screen.engine = ObjectProperty()
         name_screen.clear_widgets(name_screen.children[:-2])
         name_screen.num_players = 0
+        name_screen.hard_mode = False
+        name_screen.turbo = False
 
     def reset_game_screen(self, game_screen: Screen, play_again: bool = True) -> None:
         """Reset GameScreen widgets.
@@ -770,14 +1021,12 @@ class ResultsScreen(Screen):
 
         # game_screen.base.dice.remove_dice(game_screen.base.dice.children)
         game_screen.base.score_area.clear_widgets()
-        game_screen.base.list_o_winners.clear()
         game_screen.base.current_player = ObjectProperty()
         game_screen.base.buttons.end_turn.disabled = False
         game_screen.base.buttons.end_turn.color = rgba(colors['text'])
 
         if not play_again:
-            game_screen.base.active_game = ObjectProperty()
-            game_screen.base.list_o_players.clear()
+            game_screen.base.engine = ObjectProperty()
 
     def reset_goal_screen(self, goal_screen: Screen) -> None:
         """Reset GoalScreen variables and labels.
@@ -799,10 +1048,10 @@ class ResultsScreen(Screen):
             box.clear_widgets()
 
         solo_screen.current_player = ObjectProperty()
-        solo_screen.base.list_o_players.clear()
         solo_screen.base.score_area.clear_widgets()
         solo_screen.turn = 0
         if not play_again:
+            solo_screen.base.engine = ObjectProperty()
             solo_screen.point_goal = 0
             solo_screen.turn_limit = 0
 
@@ -825,13 +1074,50 @@ class DieScatter(Scatter):
     touch = ObjectProperty()
 
     def __init__(self, **kwargs) -> None:
-        """Add bool attribute locked.
+        """Add bool attribute locked, the die image and the shading shown once the die is kept.
 
         :param kwargs: Passed to super.
         """
         super(DieScatter, self).__init__(**kwargs)
 
         self.locked = False
+        self.image = Image()
+        self.add_widget(self.image)
+        self.shaded = False
+        self.shade_rect = Rectangle(pos=(5, 7))
+        self.kept_shade = InstructionGroup()
+        self.kept_shade.add(Color(.9, .9, .9, .5))
+        self.kept_shade.add(self.shade_rect)
+
+    def set_face(self, face: int, scale: float) -> None:
+        """Ready a pooled die for a new roll.
+
+        :param face: Number of dots to show.
+        :param scale: Scatter scale for the screen size.
+        """
+        Animation.cancel_all(self)
+        self.id = str(face)
+        if face in die_textures:
+            self.image.texture = die_textures[face]
+        else:
+            self.image.source = die_images[face]
+        self.locked = False
+        self.unshade()
+        self.rotation = 0
+        self.scale = scale
+        self.pos = (0, 0)
+
+    def shade(self) -> None:
+        """Gray out the die to show it was kept on an earlier roll."""
+        self.shade_rect.size = (self.size[0] - 15, self.size[1] - 15)
+        if not self.shaded:
+            self.canvas.add(self.kept_shade)
+            self.shaded = True
+
+    def unshade(self) -> None:
+        if self.shaded:
+            self.canvas.remove(self.kept_shade)
+            self.shaded = False
 
     def on_touch_down(self, touch) -> bool:
         """Check the touch position, expand die image for visual feedback, grab the touch.
@@ -880,10 +1166,11 @@ class DieScatter(Scatter):
 
             touch.ungrab(self)
 
-    def add_to_keepers(self, *args: list) -> None:
+    def add_to_keepers(self, *args: list) -> list:
         """Animate die to next die_holder in die_basket if newly added, reorganize if die moved within die_basket.
 
         :param args: Unused.
+        :return: List of the Animations started.
         """
         die_basket = self.parent.parent.die_basket
         keepers = die_basket.keepers
@@ -909,12 +1196,15 @@ class DieScatter(Scatter):
             else:
                 anim &= Animation(rotation=360, d=0.5)
             anim.start(self)
+            return [anim]
 
-        else:
-            # if the die is still in die_basket and has moved from its die_holder, put it back.
-            for die_holder, keeper in zip(die_holders[len(old_keepers):], keepers):
-                anim = Animation(pos=(die_holder.pos[0] + 20, die_holder.pos[1]), d=0.2)
-                anim.start(keeper)
+        # if the die is still in die_basket and has moved from its die_holder, put it back.
+        animations = []
+        for die_holder, keeper in zip(die_holders[len(old_keepers):], keepers):
+            anim = Animation(pos=(die_holder.pos[0] + 20, die_holder.pos[1]), d=0.2)
+            anim.start(keeper)
+            animations.append(anim)
+        return animations
 
     def remove_from_keepers(self) -> None:
         """Remove die from list and reorganize the die_basket"""
@@ -935,29 +1225,55 @@ class DieScatter(Scatter):
 class Dice(Widget):
     """Platform owning and controlling all dice. Inherits from Widget."""
 
-    num_dice = NumericProperty()
+    roll = NumericProperty()
+
+    def __init__(self, **kwargs) -> None:
+        """Make the six dice every roll reuses.
+
+        :param kwargs: Passed to super.
+        """
+        super(Dice, self).__init__(**kwargs)
+        self.pool = [DieScatter() for _ in range(6)]
+        # Animations of the last roll landing.
+        self.rolling = []
+
+    def get_die(self, face: int, scale: float) -> DieScatter:
+        """Take a die off the table from the pool and re-face it.
 
-    def update_dice(self, num_dice: int) -> None:
+        :param face: Number of dots to show.
+        :param scale: Scatter scale for the screen size.
+        :return: A DieScatter, not yet on the table.
+        """
+        die = next((die for die in self.pool if not die.parent), None)
+        if not die:
+            die = DieScatter()
+            self.pool.append(die)
+        die.set_face(face, scale)
+        return die
+
+    def update_dice(self, roll: int) -> None:
         """Determine dice to be removed.
 
-        Call remove_dice on them, schedule call to update_dice_two after remove_dice is done.
+        Call remove_dice on them, then update_dice_two once they're off the table.
 
-        :param num_dice:
+        :param roll: Roll code of the dice engine threw.
         """
         doomed_dice = [widget for widget in self.children if widget not in self.parent.die_basket.old_keepers]
-        self.remove_dice(doomed_dice)
-        self.num_dice = num_dice
-        Clock.schedule_once(self.update_dice_two, .8)
+        # the roll is thrown, dice on their way off the table can't be kept.
+        for die in doomed_dice:
+            die.locked = True
+        self.roll = roll
+        Sequence(partial(self.remove_dice, doomed_dice), self.update_dice_two).start()
 
     def update_dice_two(self, *args: list) -> None:
-        """Generate new dice and add them to screen in randomized positions.
+        """Add the dice of the roll to screen in randomized positions.
 
         :param args: Unused.
         :return: None.
         """
-        sound = sounds[2]
-        sound.play()
-        num_dice = self.num_dice
+        sounds.play(2)
+        roll = list(decode(self.roll))
+        shuffle(roll)
 
         # Randomized dice positions.
         positions = [{'x': uniform(.05, .25), 'y': uniform(.4, .52)},  # Top row.
@@ -967,14 +1283,11 @@ class Dice(Widget):
                      {'x': uniform(.35, .55), 'y': uniform(.15, .27)},
                      {'x': uniform(.65, .85), 'y': uniform(.15, .27)}]
 
-        roll = [randint(1, 6) for _ in range(num_dice)]
-        new_dice = []
+        self.rolling = []
         scale = (Window.height / 1000) + .1
 
-        for x, pos in zip(roll, positions[:num_dice + 1]):
-            scatter = DieScatter(id=str(x), scale=scale)
-            image = Image(source=die_images[x])
-            scatter.add_widget(image)
+        for x, pos in zip(roll, positions):
+            scatter = self.get_die(x, scale)
             self.add_widget(scatter)
 
             if self.parent.current_player.comp_player:
@@ -982,12 +1295,14 @@ class Dice(Widget):
 
             anim = Animation(pos=(self.parent.width * pos['x'] * .7, self.parent.height * pos['y']), d=0.5)
             anim &= Animation(rotation=randint(-360, 360), d=0.75)
+            anim.bind(on_complete=self.landed)
             anim.start(scatter)
+            self.rolling.append(anim)
 
-            new_dice.append(scatter)
-
-        # check to see if any new_dice are scoring dice.
-        if not self.parent.active_game.choose_dice(new_dice):
+        self.parent.update_display('round')
+        self.parent.update_hint()
+        # engine ends the turn when no dice score.
+        if self.parent.turn_over:
             popup = FarklePopup()
             popup.bind(on_dismiss=self.parent.parent.next_round)
             popup.open()
@@ -997,17 +1312,27 @@ class Dice(Widget):
         if self.parent.current_player.comp_player:
             self.parent.parent.continue_overlord_turn()
 
+    def landed(self, animation: Animation, die) -> None:
+        """Stop waiting on a die of the last roll once it lands."""
+        if animation in self.rolling:
+            self.rolling.remove(animation)
+
     # noinspection PyArgumentList
-    def remove_dice(self, dice: list) -> None:
+    def remove_dice(self, dice: list) -> list:
         """Animate dice off screen and schedule complete.
 
+        Removed dice go back to the pool once off the table.
+
         :param dice: List of DieScatter objects.
+        :return: List of the Animations started.
         """
-        anim = Animation(pos=(-50, -50), d=0.5, t='in_out_quad')
-        anim.bind(on_complete=lambda animation, die_scatter: self.complete_removal(die_scatter))
-        if dice:
-            for die in dice:
-                anim.start(die)
+        animations = []
+        for die in dice:
+            anim = Animation(pos=(-50, -50), d=0.5, t='in_out_quad')
+            anim.bind(on_complete=lambda animation, die_scatter: self.complete_removal(die_scatter))
+            anim.start(die)
+            animations.append(anim)
+        return animations
 
     def complete_removal(self, die) -> None:
         """Remove dice after animation complete."""
@@ -1050,7 +1375,7 @@ class InformationStation(FloatLayout):
         for holder in info_holders:
             # if holder.children:
             holder.clear_widgets()
-        for player in base.list_o_players:
+        for player in base.engine.game.player_list:
             lil_box = BoxLayout(id=player.name)
             turn_indicator_holder = Widget(id='turn',
                                            size_hint=(.025, 1),
@@ -1187,14 +1512,7 @@ class YouSurePopup(MyPopup):
 
         :param args: Unused.
         """
-        game_screen = next(screen for screen in self.parent.children[1].screens if screen.name == 'game')
-        solo_screen = next(screen for screen in self.parent.children[1].screens if screen.name == 'solo')
-
-        if len(game_screen.base.list_o_players) > 1:
-            game_screen.next_round()
-        else:
-            solo_screen.next_round()
-
+        self.parent.children[1].current_screen.next_round()
         self.dismiss()
 
 
@@ -1311,7 +1629,8 @@ class ReallyQuit(MyPopup):
         """
         self.dismiss()
         screen_manager = self.parent.children[1]
-        results = next(screen for screen in screen_manager.screens if screen.name == 'results')
+        results = screen_manager.get_screen('results')
+        screen_manager.get_screen('game').cancel_overlord()
 
         for screen in screen_manager.screens:
             if screen.name == 'number':
@@ -1456,10 +1775,10 @@ class LastChancePopup(MyPopup):
 
     def on_open(self):
         screen_manager = self.parent.children[1]
-        game_screen = next(screen for screen in screen_manager.screens if screen.name == 'game')
+        game_screen = screen_manager.get_screen('game')
         current_player = game_screen.base.current_player
-        winner_list = game_screen.base.list_o_winners
-        winner = sorted(game_screen.base.list_o_winners, key=lambda player: player.total_score, reverse=True)[0]
+        winner_list = game_screen.base.engine.winners
+        winner = sorted(winner_list, key=lambda player: player.total_score, reverse=True)[0]
 
         self.title = f'{current_player.name.title()}, this is your Last Chance!'
 
@@ -1494,6 +1813,25 @@ class RulesButton(Button):
         popup.open()
 
 
+class HintButton(Button):
+    """Turn the roll or bank hint on or off.
+
+    Inherits from Button.
+    Overrides on_release.
+    """
+
+    def on_release(self) -> None:
+        """Toggle hints on base."""
+        base = self.parent.parent
+        base.show_hints = not base.show_hints
+        self.text = 'HINTS: ON' if base.show_hints else 'HINTS: OFF'
+        set_text_to_fit(self)
+        if base.show_hints and not base.hints_ready:
+            # solve the policies hints are read from on the thinker thread, and show the hint once they're ready.
+            Decision(solve_policies, lambda _: base.hints_solved())
+        base.update_hint()
+
+
 class KeepAll(Button):
     """Button for adding all dice to the keeper_box.
 
@@ -1508,8 +1846,8 @@ class KeepAll(Button):
             return
         dice = self.parent.parent.dice.children
         for die in dice:
-            if (die not in self.parent.parent.die_basket.old_keepers and
-                    die not in self.parent.parent.die_basket.keepers):
+            # old keepers and dice of the last roll leaving the table are locked.
+            if not die.locked and die not in self.parent.parent.die_basket.keepers:
                 die.add_to_keepers()
 
 
@@ -1548,23 +1886,19 @@ class EndTurn(Button):
         if self.parent.parent.current_player.comp_player and not args:
             return
         base = self.parent.parent
+        engine = base.engine
         # check that player has met first turn threshold.
-        if (base.die_basket.valid_basket == rgba(colors['valid'])
-                and base.current_player.total_score == 0
-                and (base.current_player.round_score + base.current_player.basket_score) < 500):
+        if engine.valid_basket and base.current_player.total_score == 0 and engine.turn_points < threshold:
             popup = ThresholdNotMet()
             popup.open()
-        # check if points are still on the board.
-        elif (base.die_basket.valid_basket == rgba(colors['valid']) and
-              ([die for die in base.active_game.choose_dice([die for die in base.dice.children
-                                                             if die not in base.die_basket.old_keepers])
-                if die not in base.die_basket.keepers])):
+        # check if points are still on the board. comp_player leaves them there on purpose.
+        elif (not base.current_player.comp_player and
+              engine.valid_basket and
+              engine.game.choose_dice(engine.dice) != engine.keepers):
             popup = YouSurePopup()
             popup.open()
         # check for non-scoring dice in the keeper_box.
-        elif (base.die_basket.valid_basket == rgba(colors['error']) and
-              base.die_basket.keepers and
-              base.active_game.validate_choice([int(die.id) for die in base.die_basket.keepers])):
+        elif not engine.valid_basket and engine.keepers and engine.game.validate_choice(engine.keepers):
             popup = NonKeeperKept()
             popup.open()
         # everything looks good.
@@ -1580,38 +1914,41 @@ class Roll(Button):
     """
 
     def on_release(self, *args: list) -> None:
-        """Clear non-keepers, gray out keepers, add them to old_keepers.
+        """Roll through engine, gray out keepers, add them to old_keepers.
 
-        Call update_color, update_round_score, and update_dice.
+        Call update_dice and update_color.
 
         :param args: Will have non-zero len if called by comp_player.
         :return: None.
         """
+        base = self.parent.parent
         # do nothing if comp_player turn.
-        if self.parent.parent.current_player.comp_player and not args:
+        if base.current_player.comp_player and not args:
             return
 
-        die_basket = self.parent.parent.die_basket
+        # a turbo comp_player plays the whole turn at once.
+        if base.current_player.comp_player and base.current_player.turbo:
+            base.parent.play_turbo_turn()
+            return
+
+        die_basket = base.die_basket
         keepers = die_basket.keepers
         old_keepers = die_basket.old_keepers
 
-        if die_basket.valid_basket == rgba(colors['valid']):
-            for keeper in keepers:
-                old_keepers.append(keeper)
-            if len(old_keepers) >= 6:
+        if base.engine.valid_basket:
+            old_keepers.extend(keepers)
+            # keeping all six dice earns a fresh roll of six.
+            if base.engine.dice_left == 6:
                 old_keepers.clear()
-            self.parent.parent.dice.update_dice(6 - len(old_keepers))
-
-        self.parent.parent.update_round_score()
+            base.dice.update_dice(base.engine.roll())
+            # a fresh roll needs keepers before the turn goes on.
+            die_basket.valid_basket = rgba(colors['error'])
 
         for keeper in old_keepers:
             keeper.locked = True
 
         for keeper in die_basket.keepers:
-            gray = InstructionGroup()
-            gray.add(Color(.9, .9, .9, .5))
-            gray.add(Rectangle(pos=(5, 7), size=(keeper.size[0] - 15, keeper.size[1] - 15)))
-            keeper.canvas.add(gray)
+            keeper.shade()
 
         die_basket.keepers.clear()
         self.update_color()
@@ -1632,7 +1969,7 @@ class Roll(Button):
             self.color = rgba(colors['text'])
             current_player = self.parent.parent.current_player
             if (current_player.total_score + current_player.round_score +
-                    self.parent.parent.current_player.basket_score) >= 500:
+                    self.parent.parent.current_player.basket_score) >= threshold:
                 self.parent.end_turn.text = 'KEEP POINTS'
                 set_text_to_fit(self.parent.end_turn)
                 self.text = 'RISK \'N ROLL!'
@@ -1651,122 +1988,149 @@ class Quit(Button):
 class Base(FloatLayout):
     """A container for all gameplay and display objects. Inherits from FloatLayout."""
 
-    list_o_players = deque()
-    list_o_winners = ListProperty()
-    active_game = ObjectProperty()
+    engine = ObjectProperty()
     buttons = ObjectProperty()
     current_player = ObjectProperty()
     die_basket = ObjectProperty()
     dice = ObjectProperty()
     info = ObjectProperty()
     score_area = ObjectProperty()
+    hint = ObjectProperty()
+    show_hints = BooleanProperty(False)
+    hints_ready = BooleanProperty(False)
 
-    def get_active_game_players(self) -> deque:
-        """Create list_o_players from active_game.player_list.
-
-        :return: A deque, list_o_players.
-        """
-        for player in self.active_game.player_list:
-            self.list_o_players.append(player)
-        self.info.add_player_totals()
-        return self.list_o_players
-
-    def update_round_score(self, green_line=None) -> None:
-        """Add basket_score to round_score and call update_display to reflect update.
+    def __init__(self, **kwargs) -> None:
+        """Set up coalesced score display updates.
 
-        :param green_line: True when changing players to start with green scoring line and active Roll button.
+        :param kwargs: Passed to super.
         """
-        die_basket = self.die_basket
-        if die_basket.valid_basket == rgba(colors['valid']):
-            self.current_player.round_score += self.current_player.basket_score
-            self.update_display('round')
-
-            if not green_line:
-                die_basket.valid_basket = rgba(colors['error'])
-                self.buttons.roll.background_color = rgba(colors['prime off'])
-
-        self.current_player.basket_score = 0
-
-    def update_total_score(self) -> None:
-        """Add round_score to total_score."""
-        if self.die_basket.valid_basket == rgba(colors['valid']):
-            # player has not hit the first turn threshold yet.
-            if self.current_player.total_score == 0 and self.current_player.round_score < 500:
-                self.current_player.round_score = 0
-
-            if self.current_player.total_score > 0 or self.current_player.round_score >= 500:
-                self.current_player.total_score += self.current_player.round_score
-                self.current_player.round_score = 0
+        super(Base, self).__init__(**kwargs)
+        # engine.turns when current_player's turn was shown.
+        self.engine_turn = 0
+        # player: {display: score_type} waiting for the next frame.
+        self.dirty = {}
+        # update_display calls absorbed by one already waiting.
+        self.redundant_updates = 0
+        self.flush_trigger = Clock.create_trigger(self.flush_display)
+
+    def show_turn(self) -> None:
+        """Show the turn engine has handed out."""
+        self.current_player = self.engine.current_player
+        self.engine_turn = self.engine.turns
+
+    @property
+    def turn_over(self) -> bool:
+        """True once engine has ended the turn shown, on a farkle or a turbo turn, before the screen catches up."""
+        return self.engine.over or self.engine.turns != self.engine_turn
+
+    def end_turn(self) -> None:
+        """Bank the turn shown through engine, or lose it for an invalid basket, unless engine ended it already."""
+        if not self.turn_over:
+            self.engine.end_turn()
+
+    def hints_solved(self) -> None:
+        """Show hints now the policies they're read from are solved."""
+        self.hints_ready = True
+        self.update_hint()
+
+    def update_hint(self) -> None:
+        """Show a human player the odds of rolling on with their keepers, and the best dice to keep."""
+        player = self.current_player
+        if (not self.show_hints or not self.hints_ready or getattr(player, 'comp_player', True) or self.turn_over
+                or not self.engine.dice):
+            self.hint.text = ''
+            return
 
+        engine = self.engine
+        points = engine.turn_points
+        if engine.winners:
+            # on a last chance only passing the leader counts.
+            leader = max(winner.total_score for winner in engine.winners)
+            advice = last_chance_hint(points, engine.dice_left, engine.dice, player.round_score,
+                                      needed_points(player.total_score, leader))
+            odds = (f'Roll: {advice.bust:.0%} bust, {advice.roll_value:.0%} to pass {leader:,}    '
+                    f'Bank: {advice.bank_value:.0%}')
         else:
-            self.current_player.round_score = 0
+            advice = hint(points, engine.dice_left, engine.dice, player.round_score,
+                          0 if player.total_score else threshold)
+            odds = f'Roll: {advice.bust:.0%} bust, {advice.roll_value:,.0f} expected    Bank: {advice.bank_value:,}'
+
+        if not engine.keepers or not engine.valid_basket:
+            odds = 'Keep scoring dice to roll or bank'
+        keep = ' '.join(map(str, decode(advice.keep.code))) if advice.keep else 'nothing scores'
+        self.hint.text = f'{odds}\nBest keep: {keep}'
+        set_text_to_fit(self.hint)
 
     def update_display(self, score_type: str) -> None:
-        """Helper function calls functions based on score_type.
+        """Mark current_player's score_type display for redrawing next frame.
+
+        Several updates of a display in one frame are drawn once. 'round' and 'basket' share the round display, so
+        the later of them wins.
 
         :param score_type: May be: 'round', 'basket', 'total, 'progress', or 'solo total'.
         """
-        if score_type == 'round' or score_type == 'basket':
-            self.update_round_display(score_type)
-        if score_type == 'total':
-            self.update_total_display()
-        if score_type == 'progress':
-            self.update_progress_display()
-        if score_type == 'solo total':
-            self.update_solo_total_display()
+        display = 'round' if score_type == 'basket' else score_type
+        dirty = self.dirty.setdefault(self.current_player, {})
+        if display in dirty:
+            self.redundant_updates += 1
+        dirty[display] = score_type
+        self.flush_trigger()
+
+    def flush_display(self, *args: list) -> None:
+        """Draw every display marked by update_display, fitting each player's score text once.
 
-    def update_round_display(self, score_type: str) -> None:
+        :param args: Unused.
+        """
+        dirty, self.dirty = self.dirty, {}
+        for player, displays in dirty.items():
+            if not player.score_display:
+                continue
+            for score_type in displays.values():
+                if score_type == 'round' or score_type == 'basket':
+                    self.update_round_display(player, score_type)
+                if score_type == 'total':
+                    self.update_total_display(player)
+                if score_type == 'progress':
+                    self.update_progress_display(player)
+                if score_type == 'solo total':
+                    self.update_solo_total_display(player)
+            set_group_text_to_fit(player.score_display.children)
+            if 'total' in displays or 'solo total' in displays:
+                set_text_to_fit(player.info.children[0])
+
+    def update_round_display(self, player, score_type: str) -> None:
         """Update player's round and total_plus displays in ScoreArea.
 
+        :param player: Player to draw.
         :param score_type: 'basket' or 'round'
         """
         if score_type == 'basket':
-            self.current_player.score_display.round.text = 'Round: {:,}'.format(self.current_player.round_score +
-                                                                                self.current_player.basket_score)
-            self.current_player.score_display.total_plus.text = 'Round + Total: {:,}'.format(
-                self.current_player.total_score +
-                self.current_player.round_score +
-                self.current_player.basket_score)
-            self.set_score_text_size()
+            player.score_display.round.text = f'Round: {player.round_score + player.basket_score:,}'
+            player.score_display.total_plus.text = \
+                f'Round + Total: {player.total_score + player.round_score + player.basket_score:,}'
         if score_type == 'round':
-            # pass
-            self.current_player.score_display.round.text = f'Round: {self.current_player.round_score:,}'
-            self.set_score_text_size()
+            player.score_display.round.text = f'Round: {player.round_score:,}'
 
     def set_score_text_size(self, *args) -> None:
-        min_font_size = 1000
-        for score in self.current_player.score_display.children:
-            set_text_to_fit(score)
-            if score.font_size < min_font_size:
-                min_font_size = score.font_size
-        for score in self.current_player.score_display.children:
-            score.font_size = min_font_size
+        set_group_text_to_fit(self.current_player.score_display.children)
 
     def set_info_text_size(self, *args) -> None:
         set_text_to_fit(self.current_player.info.children[0])
 
-    def update_total_display(self) -> None:
+    def update_total_display(self, player) -> None:
         """Update player's total display in ScoreArea and InformationStation."""
-        self.current_player.info.children[0].text = f'{self.current_player.total_score:,}'
-        self.current_player.score_display.total.text = f'Total: {self.current_player.total_score:,}'
-        self.set_score_text_size()
-        self.set_info_text_size()
+        player.info.children[0].text = f'{player.total_score:,}'
+        player.score_display.total.text = f'Total: {player.total_score:,}'
 
-    def update_progress_display(self) -> None:
-        """Update player's progress display in ScoreArea"""
-        self.current_player.score_display.progress.text = f'{self.parent.turn} / {self.parent.turn_limit}'
-        self.set_score_text_size()
+    def update_progress_display(self, player) -> None:
+        """Update player's progress display in ScoreArea, with the turns played before this one."""
+        player.score_display.progress.text = f'{self.parent.turn - 1} / {self.parent.turn_limit}'
 
-    def update_solo_total_display(self) -> None:
+    def update_solo_total_display(self, player) -> None:
         """Update player's progress toward point_goal in InformationStation and total_plus in ScoreArea."""
-        self.current_player.score_display.total_plus.text = 'Round + Total: {:,}'.format(
-            self.current_player.total_score +
-            self.current_player.round_score +
-            self.current_player.basket_score)
-        self.current_player.info.children[0].text = \
-            f'{self.current_player.total_score:,} / \n{self.parent.point_goal:,}'
-        self.set_score_text_size()
-        self.set_info_text_size()
+        player.score_display.total_plus.text = \
+            f'Round + Total: {player.total_score + player.round_score + player.basket_score:,}'
+        player.info.children[0].text = f'{player.total_score:,} / \n{self.parent.point_goal:,}'
 
 
 class DieBasket(FloatLayout):
@@ -1780,7 +2144,7 @@ class DieBasket(FloatLayout):
     keepers = ListProperty()
     old_keepers = ListProperty()
     valid_basket = ListProperty()
-    active_game = ObjectProperty()
+    engine = ObjectProperty()
     keeper_box = ObjectProperty()
 
     def on_parent(self, *args) -> None:
@@ -1791,30 +2155,20 @@ class DieBasket(FloatLayout):
         self.valid_basket = rgba(colors['valid'])
 
     def on_keepers(self, *args: list) -> None:
-        """Check if newly added die is a keeper or completes a group of three.
+        """Keep the dice in keepers through engine, which scores them and checks every one scores.
 
         Update keeper line and Roll button accordingly.
 
         :param args: Unused.
         """
-        choice = [int(child.id) for child in self.keepers]
-
-        score = self.active_game.keep_score(choice)
-        self.parent.current_player.basket_score = score
+        if self.parent.turn_over:
+            return
+        scored = self.engine.keep([int(child.id) for child in self.keepers])
         self.parent.update_display('basket')
 
-        # validate_choice returns a list of non-scoring dice.
-        scored = self.active_game.validate_choice(choice)
-        scored = not bool(scored)
-
-        roll_button = self.parent.buttons.roll
-        if not scored or not choice:
-            self.valid_basket = rgba(colors['error'])
-            roll_button.update_color()
-
-        if scored and choice:
-            self.valid_basket = rgba(colors['valid'])
-            roll_button.update_color()
+        self.valid_basket = rgba(colors['valid']) if scored else rgba(colors['error'])
+        self.parent.buttons.roll.update_color()
+        self.parent.update_hint()
 
 
 class PlayerNumDropDown(DropDown):
@@ -1873,6 +2227,8 @@ class SoloGoalScreen(Screen):
 
     point_goal = NumericProperty()
     turn_limit = NumericProperty()
+    # the challenge odds being solved off the main thread, if any.
+    difficulty = None
 
     def on_pre_enter(self) -> None:
         """Set up screen with labels, buttons and drop-down menus."""
@@ -1939,7 +2295,7 @@ class SoloGoalScreen(Screen):
         self.goals.points.text = f'Points goal: {self.point_goal:,}'
         set_text_to_fit(self.goals.points)
         if self.parent:
-            solo_game = [screen for screen in self.parent.screens if screen.name == 'solo'][0]
+            solo_game = self.parent.get_screen('solo')
             solo_game.point_goal = int(self.point_goal)
         if self.turn_limit and self.point_goal:
             self.set_difficulty()
@@ -1952,33 +2308,58 @@ class SoloGoalScreen(Screen):
         self.goals.turns.text = f'Turn limit: {self.turn_limit}'
         set_text_to_fit(self.goals.turns)
         if self.parent:
-            solo_game = [screen for screen in self.parent.screens if screen.name == 'solo'][0]
+            solo_game = self.parent.get_screen('solo')
             solo_game.turn_limit = int(self.turn_limit)
         if self.point_goal and self.turn_limit:
             self.set_difficulty()
 
     def set_difficulty(self) -> None:
-        """Update difficulty label by points per turn."""
-        diff = 'Difficulty: '
-        points_per_turn = self.point_goal // self.turn_limit
-        if 0 < points_per_turn <= 125:
-            diff = 'Difficulty: Really Easy'
-        elif 125 < points_per_turn <= 175:
-            diff = 'Difficulty: Easy'
-        elif 175 < points_per_turn <= 250:
-            diff = 'Difficulty: Medium'
-        elif 250 < points_per_turn <= 500:
-            diff = 'Difficulty: Hard'
-        elif 500 < points_per_turn <= 750:
-            diff = 'Difficulty: Really Hard'
-        elif points_per_turn > 750:
-            diff = 'Difficulty: Possible'
-        self.goals.diff.text = diff
+        """Update difficulty label by the chance of reaching point_goal within turn_limit under best play.
+
+        Challenges the shipped table doesn't cover are solved off the main thread, the label updates when done.
+        """
+        point_goal = int(self.point_goal)
+        turn_limit = int(self.turn_limit)
+        if self.difficulty:
+            self.difficulty.cancel()
+            self.difficulty = None
+        if table_covers(point_goal, turn_limit):
+            self.show_difficulty(point_goal, turn_limit, success_chance(point_goal, turn_limit))
+            return
+
+        self.goals.diff.text = 'Difficulty: working it out...'
+        set_text_to_fit(self.goals.diff)
+        self.difficulty = Decision(partial(success_chance, point_goal, turn_limit),
+                                   partial(self.show_difficulty, point_goal, turn_limit))
+
+    def show_difficulty(self, point_goal: int, turn_limit: int, chance: float) -> None:
+        """Show how hard a challenge is.
+
+        :param point_goal: Points goal the chance is for.
+        :param turn_limit: Turn limit the chance is for.
+        :param chance: Chance of finishing the challenge.
+        """
+        # the challenge may have changed while its chance was solved.
+        if (point_goal, turn_limit) != (int(self.point_goal), int(self.turn_limit)):
+            return
+        if chance >= .95:
+            diff = 'Really Easy'
+        elif chance >= .75:
+            diff = 'Easy'
+        elif chance >= .5:
+            diff = 'Medium'
+        elif chance >= .25:
+            diff = 'Hard'
+        elif chance >= .05:
+            diff = 'Really Hard'
+        else:
+            diff = 'Possible'
+        self.goals.diff.text = f'Difficulty: {diff} ({chance:.0%})'
         set_text_to_fit(self.goals.diff)
 
     def to_menu_screen(self) -> None:
         """Reset PlayerNumberScreen stuff and go to menu screen."""
-        number_screen = next(screen for screen in self.parent.screens if screen.name == 'number')
+        number_screen = self.parent.get_screen('number')
         number_screen.num_players = 0
         number_screen.num_label.text = 'Players Selected: '
         self.goals.diff.text = 'Difficulty:'
@@ -2018,10 +2399,10 @@ class SoloGameScreen(Screen):
 
         :param args: Unused.
         """
-        self.base.get_active_game_players()
+        self.base.info.add_player_totals()
 
-        player = self.base.list_o_players[0]
-        self.base.current_player = player
+        self.base.show_turn()
+        player = self.base.current_player
         player_score = SoloPLayerScore(id=player.name)
 
         name_area = player_score.name
@@ -2049,21 +2430,20 @@ class SoloGameScreen(Screen):
                 self.set_screen_text_sizes(widget)
 
     def next_round(self, *args: list) -> None:
-        """Reset all base variables and widgets to initial state, check game status, increment turn."""
-        self.base.update_round_score(green_line=True)
-        self.base.update_total_score()
+        """End the turn, reset all base variables and widgets to initial state, check game status, increment turn."""
+        # turn 0 sets the table for the first turn.
+        if self.turn:
+            self.base.end_turn()
         self.base.die_basket.valid_basket = rgba(colors['valid'])
         self.base.buttons.roll.update_color()
         self.base.buttons.roll.text = 'ROLL \'EM!'
         set_text_to_fit(self.base.buttons.roll)
         self.base.buttons.end_turn.text = 'END TURN'
         set_text_to_fit(self.base.buttons.end_turn)
-        self.base.current_player.round_score = 0
         self.base.die_basket.keepers.clear()
         self.base.die_basket.old_keepers.clear()
         self.base.dice.remove_dice(self.base.dice.children)
         self.base.update_display('round')
-        self.base.update_display('progress')
         self.base.update_display('solo total')
         self.base.update_display('basket')
 
@@ -2075,11 +2455,16 @@ class SoloGameScreen(Screen):
                 message = f'Oh no, {self.base.current_player.name.title()}!\n\n' \
                     f'You\'re out of turns\n\nand only got {self.base.current_player.total_score:,} points.'
 
-            results_screen = next(screen for screen in self.parent.screens if screen.name == 'results')
+            self.base.engine.game.log.save(game_log_path())
+            results_screen = self.parent.get_screen('results')
             results_screen.message = message
             results_screen.game_mode = 'solo'
             Clock.schedule_once(self.results_screen, .5)
+        else:
+            self.base.show_turn()
         self.turn += 1
+        # drawn next frame, so queued once turn is final.
+        self.base.update_display('progress')
 
     def results_screen(self, *args: list) -> None:
         """Set current screen to ResultsScreen.
@@ -2090,37 +2475,68 @@ class SoloGameScreen(Screen):
 
 
 class Screens(ScreenManager):
-    """Manages available screens. Inherits from ScreenManager"""
+    """Manages available screens, building each the first time it's needed. Inherits from ScreenManager"""
 
-    def __init__(self, **kwargs) -> None:
-        """Add and name all screens.
+    screen_classes = {'menu': MenuScreen,
+                      'number': PlayerNumberScreen,
+                      'name': PlayerNameScreen,
+                      'game': GameScreen,
+                      'goal': SoloGoalScreen,
+                      'solo': SoloGameScreen,
+                      'results': ResultsScreen}
 
-        :param kwargs: Passed to super.
-        """
-        super(Screens, self).__init__(**kwargs)
+    def get_screen(self, name: str) -> Screen:
+        """Get a screen by name, building it if it hasn't been yet.
 
-        self.add_widget(MenuScreen(name='menu'))
-        self.add_widget(PlayerNumberScreen(name='number'))
-        self.add_widget(SoloGoalScreen(name='goal'))
-        self.add_widget(SoloGameScreen(name='solo'))
-        self.add_widget(PlayerNameScreen(name='name'))
-        self.add_widget(GameScreen(name='game'))
-        self.add_widget(ResultsScreen(name='results'))
+        :param name: Screen name.
+        :return: The Screen.
+        """
+        if name not in self.screen_names and name in self.screen_classes:
+            self.add_widget(self.screen_classes[name](name=name))
+        return super(Screens, self).get_screen(name)
 
-        Clock.schedule_once(self.to_menu_screen, .5)
+    def prewarm(self, names: list, *args: list) -> None:
+        """Build screens one per frame, so later navigation doesn't wait on them.
 
-    def to_menu_screen(self):
-        self.current = 'menu'
+        :param names: Screen names, built in order.
+        :param args: Unused.
+        """
+        if names:
+            self.get_screen(names[0])
+            Clock.schedule_once(partial(self.prewarm, names[1:]), .1)
 
 
 class GameApp(App):
     """Base class with main loop internals."""
 
+    def load_kv(self, filename=None):
+        loaded = super(GameApp, self).load_kv(filename)
+        startup.mark('kv build')
+        return loaded
+
     def build(self):
-        """Set title and return widget tree root."""
+        """Set title, load die textures and return widget tree root."""
         self.title = 'Ten Thousand'
+        # hand the interpreter back to the main thread often enough to draw every frame while comp_player thinks.
+        sys.setswitchinterval(.001)
+        preload_textures()
+        startup.mark('assets')
         return self.root
 
+    def on_start(self):
+        Window.bind(on_flip=self.first_frame)
+
+    def first_frame(self, *args: list) -> None:
+        """Log startup times, then build the other screens and load the roll sound in the background.
+
+        :param args: Unused.
+        """
+        Window.unbind(on_flip=self.first_frame)
+        startup.mark('first frame')
+        Logger.info(f'Startup: {startup.report()}')
+        Clock.schedule_once(partial(self.root.prewarm, ['number', 'name', 'game', 'goal', 'solo', 'results']), .5)
+        Clock.schedule_once(lambda dt: sounds.preload([2]), .5)
+
 
 Window.softinput_mode = 'below_target'
 Window.keyboard_padding = 5
@@ -1,37 +1,130 @@
+import os
+import sys
+import threading
 from kivy.core.audio import SoundLoader
 
-die_images = {
-    1: 'images/1_dots.png',
-    2: 'images/2_dots.png',
-    3: 'images/3_dots.png',
-    4: 'images/4_dots.png',
-    5: 'images/5_dots.png',
-    6: 'images/6_dots.png',
-}
-
-tables = {
-    1: 'images/tabletop1.jpg',
-    2: 'images/tabletop2.jpg',
-    3: 'images/tabletop3.jpg',
-    4: 'images/tabletop4.jpg',
-    5: 'images/tabletop5.jpg',
-    6: 'images/tabletop6.jpg'
-}
-
-sound_1 = SoundLoader.load('sounds/sound1.wav')
-sound_2 = SoundLoader.load('sounds/sound2.wav')
-sound_3 = SoundLoader.load('sounds/sound3.wav')
-sound_4 = SoundLoader.load('sounds/sound4.wav')
-sound_5 = SoundLoader.load('sounds/sound5.wav')
-sound_6 = SoundLoader.load('sounds/sound6.wav')
-
-sounds = {
-    1: sound_1,
-    2: sound_2,
-    3: sound_3,
-    4: sound_4,
-    5: sound_5,
-    6: sound_6
-}
+# atlases packed by build_atlas, used when present.
+dice_atlas = 'images/dice'
+tables_atlas = 'images/tables'
+
+
+def image_source(atlas: str, name: str, path: str) -> str:
+    """Source for an image, from its atlas if that has been built.
+
+    :param atlas: Atlas path without extension.
+    :param name: Image id in the atlas.
+    :param path: Image file.
+    :return: atlas:// url or path.
+    """
+    if os.path.exists(f'{atlas}.atlas'):
+        return f'atlas://{atlas}/{name}'
+    return path
+
+
+die_images = {face: image_source(dice_atlas, f'{face}_dots', f'images/{face}_dots.png') for face in range(1, 7)}
+
+tables = {number: image_source(tables_atlas, f'tabletop{number}', f'images/tabletop{number}.jpg')
+          for number in range(1, 7)}
+
+# die face textures, filled by preload_textures.
+die_textures = {}
+
+
+def preload_textures() -> None:
+    """Load every die face texture once, so rolls never wait on the filesystem or an image decoder."""
+    from kivy.core.image import Image as CoreImage
+
+    for face, source in die_images.items():
+        die_textures[face] = CoreImage(source).texture
+
+
+def build_atlas(with_tables: bool = False, table_width: int = 640) -> None:
+    """Pack the die faces, and optionally the tabletops scaled down to table_width, into Kivy atlases.
+
+    Needs Pillow, only when building.
+    """
+    import tempfile
+    from kivy.atlas import Atlas
+    from PIL import Image as PILImage
+
+    Atlas.create(dice_atlas, [f'images/{face}_dots.png' for face in range(1, 7)], 512)
+    print(f'Wrote {dice_atlas}.atlas')
+    if with_tables:
+        with tempfile.TemporaryDirectory() as scratch:
+            scaled = []
+            for number in range(1, 7):
+                image = PILImage.open(f'images/tabletop{number}.jpg')
+                height = round(image.height * table_width / image.width)
+                path = os.path.join(scratch, f'tabletop{number}.png')
+                image.resize((table_width, height), PILImage.LANCZOS).save(path)
+                scaled.append(path)
+            Atlas.create(tables_atlas, scaled, 2048)
+        print(f'Wrote {tables_atlas}.atlas')
+
+
+class SoundBank:
+
+    """Sounds loaded on first use or in the background, kept decoded, with a few voices each so plays can overlap.
+
+    """
+
+    def __init__(self, paths: dict, voices: int = 3):
+        """Note where the sounds are, loading nothing yet.
+
+        :param paths: Dict of key: sound file.
+        :param voices: Copies of each sound, the most plays of it that can overlap.
+        """
+        self.paths = paths
+        self.voices = voices
+        self._sounds = {}
+        self._turns = {}
+        self._lock = threading.Lock()
+
+    def load(self, key) -> list:
+        """Load a sound's voices if they aren't already.
+
+        :param key: Sound key.
+        :return: List of Sound, empty if the sound can't be played.
+        """
+        with self._lock:
+            if key not in self._sounds:
+                voices = (SoundLoader.load(self.paths[key]) for _ in range(self.voices))
+                self._sounds[key] = [sound for sound in voices if sound]
+                self._turns[key] = 0
+            return self._sounds[key]
+
+    def preload(self, keys=None) -> threading.Thread:
+        """Load sounds on a background thread.
+
+        :param keys: Sound keys, defaults to all.
+        :return: The loading thread, already started.
+        """
+        keys = list(self.paths) if keys is None else keys
+        thread = threading.Thread(target=lambda: [self.load(key) for key in keys], daemon=True)
+        thread.start()
+        return thread
+
+    def play(self, key) -> None:
+        """Play a sound on an idle voice, or restart the voice played longest ago if all are busy."""
+        voices = self.load(key)
+        if not voices:
+            return
+        sound = next((voice for voice in voices if voice.state == 'stop'), None)
+        if not sound:
+            sound = voices[self._turns[key] % len(voices)]
+            self._turns[key] += 1
+            sound.stop()
+        sound.play()
+
+
+sounds = SoundBank({number: f'sounds/sound{number}.wav' for number in range(1, 7)})
 
 basket = 'images/basket.jpg'
+
+
+def main():
+    build_atlas('--tables' in sys.argv[1:])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+"""Compact binary logs of games.
+
+A log file is a sequence of game records, each a varint byte length then the record. A record is a varint format
+version, the dice seed, the points goal in steps, the turn limit and the player names, then one varint per event
+holding the event kind in its low three bits and its value above them. Rolls and keeps are stored by their dense
+roll_codes index, so most events take two bytes.
+"""
+
+from game_rules import goal
+from roll_codes import codes, decode, index
+from turn_solver import step
+
+version = 2
+
+# event kinds
+ROLL = 0
+KEEP = 1
+FARKLE = 2
+END = 3
+TURN = 4
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7f:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, position: int) -> tuple:
+    """Read a varint from data at position.
+
+    :return: Tuple of (value, position after it).
+    """
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+class GameLog:
+
+    """Append-only record of one game's rolls, keeps, farkles, turn ends and turn changes.
+
+    """
+
+    def __init__(self, name_list, seed: int = 0, goal: int = goal, turn_limit: int = 0):
+        """Start a record.
+
+        :param name_list: Player names, in seat order.
+        :param seed: Seed of the game's DiceSource.
+        :param goal: Total that ends the game.
+        :param turn_limit: Turns a challenge allows, 0 for no limit.
+        """
+        self.data = bytearray()
+        write_varint(self.data, version)
+        write_varint(self.data, seed)
+        write_varint(self.data, goal // step)
+        write_varint(self.data, turn_limit)
+        write_varint(self.data, len(name_list))
+        for name in name_list:
+            encoded = name.encode()
+            write_varint(self.data, len(encoded))
+            self.data += encoded
+
+    def event(self, kind: int, value: int = 0) -> None:
+        write_varint(self.data, value << 3 | kind)
+
+    def roll(self, code: int) -> None:
+        self.event(ROLL, index[code])
+
+    def keep(self, code: int) -> None:
+        self.event(KEEP, index[code])
+
+    def farkle(self) -> None:
+        self.event(FARKLE)
+
+    def end(self, points: int) -> None:
+        """Record a turn ending, with the points it banked."""
+        self.event(END, points // step)
+
+    def turn(self, seat: int) -> None:
+        """Record the player in seat starting a turn."""
+        self.event(TURN, seat)
+
+    def record(self) -> bytes:
+        """The log framed for appending to a file."""
+        framed = bytearray()
+        write_varint(framed, len(self.data))
+        return bytes(framed + self.data)
+
+    def save(self, path: str) -> None:
+        """Append the log to the file at path."""
+        with open(path, 'ab') as log_file:
+            log_file.write(self.record())
+
+
+def read_games(path: str):
+    """Iterate over the game records in a log file.
+
+    :param path: Log file.
+    :return: Generator of records, as memoryviews.
+    """
+    with open(path, 'rb') as log_file:
+        data = memoryview(log_file.read())
+    position = 0
+    while position < len(data):
+        length, position = read_varint(data, position)
+        yield data[position:position + length]
+        position += length
+
+
+def header(record) -> tuple:
+    """Read a record's header.
+
+    :param record: Game record, without its length.
+    :return: Tuple of (seed, player names, points goal, turn limit, position of the first event).
+    """
+    record_version, position = read_varint(record, 0)
+    if record_version not in (1, version):
+        raise ValueError(f'Unknown game log version {record_version}.')
+    seed, position = read_varint(record, position)
+    # version 1 records were all games to the default goal.
+    points_goal, turn_limit = goal, 0
+    if record_version > 1:
+        points_goal, position = read_varint(record, position)
+        points_goal *= step
+        turn_limit, position = read_varint(record, position)
+    num_players, position = read_varint(record, position)
+    names = []
+    for _ in range(num_players):
+        length, position = read_varint(record, position)
+        names.append(bytes(record[position:position + length]).decode())
+        position += length
+    return seed, names, points_goal, turn_limit, position
+
+
+def events(record):
+    """Iterate over a record's events.
+
+    :param record: Game record, without its length.
+    :return: Generator of (kind, value) pairs. Rolls and keeps are given as codes, ends as points.
+    """
+    position = header(record)[-1]
+    while position < len(record):
+        value, position = read_varint(record, position)
+        kind, value = value & 7, value >> 3
+        if kind in (ROLL, KEEP):
+            value = codes[value]
+        elif kind == END:
+            value *= step
+        yield kind, value
+
+
+class LoggedDice:
+
+    """Dice source rolling the logged roll replay sets next.
+
+    """
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self.code = 0
+
+    def roll(self, num_dice: int) -> tuple:
+        roll = decode(self.code)
+        if len(roll) != num_dice:
+            raise ValueError(f'Logged roll of {len(roll)} dice where {num_dice} were rolled.')
+        return roll
+
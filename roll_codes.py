@@ -0,0 +1,114 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+"""Compact integer encoding for rolls and keeps.
+
+A roll is packed as six base-7 digits, one per face, each holding how many dice show that face. Every ordering of
+the same dice gets the same code, codes hash as plain ints, and adding or removing dice is integer arithmetic:
+keeping dice from a roll leaves roll - keep on the table.
+"""
+
+from functools import lru_cache
+from itertools import combinations_with_replacement, product
+from math import factorial
+
+# place[face] is the value of one die showing face.
+place = (0, 1, 7, 49, 343, 2401, 16807)
+
+# Every code for 0 - 6 dice, and a dense index for using codes as array offsets.
+codes = tuple(sorted(sum(place[die] for die in dice)
+                     for num_dice in range(7)
+                     for dice in combinations_with_replacement(range(1, 7), num_dice)))
+index = {code: i for i, code in enumerate(codes)}
+
+
+def encode(dice) -> int:
+    """Pack dice into a code.
+
+    :param dice: Iterable of die faces, 1 - 6, or a code, which is returned as is.
+    :return: Integer code.
+    """
+    if isinstance(dice, int):
+        return dice
+    return sum(place[die] for die in dice)
+
+
+def from_counts(counts) -> int:
+    """Pack a count vector into a code.
+
+    :param counts: Six counts, how many dice show 1 through 6.
+    :return: Integer code.
+    """
+    return sum(count * place[face] for face, count in enumerate(counts, 1))
+
+
+@lru_cache(maxsize=None)
+def to_counts(code: int) -> tuple:
+    """Unpack a code into its count vector.
+
+    :param code: Integer code.
+    :return: Tuple of six counts, how many dice show 1 through 6.
+    """
+    counts = []
+    for _ in range(6):
+        code, count = divmod(code, 7)
+        counts.append(count)
+    return tuple(counts)
+
+
+@lru_cache(maxsize=None)
+def decode(code: int) -> tuple:
+    """Unpack a code into its dice.
+
+    :param code: Integer code.
+    :return: Sorted tuple of die faces.
+    """
+    return tuple(face for face, count in enumerate(to_counts(code), 1) for _ in range(count))
+
+
+def size(code: int) -> int:
+    """Number of dice in a code.
+
+    :param code: Integer code.
+    :return: Number of dice.
+    """
+    return sum(to_counts(code))
+
+
+def contains(code: int, other: int) -> bool:
+    """Check that every die of other is also in code.
+
+    :param code: Integer code.
+    :param other: Integer code.
+    :return: True if other is a sub-multiset of code.
+    """
+    return all(mine >= theirs for mine, theirs in zip(to_counts(code), to_counts(other)))
+
+
+@lru_cache(maxsize=None)
+def subsets(code: int) -> tuple:
+    """Every distinct sub-multiset of a code, including the empty roll and the code itself.
+
+    :param code: Integer code.
+    :return: Tuple of codes, smallest first.
+    """
+    ranges = [range(count + 1) for count in to_counts(code)]
+    return tuple(sorted(from_counts(counts) for counts in product(*ranges)))
+
+
+@lru_cache(maxsize=None)
+def rolls(num_dice: int) -> tuple:
+    """Every distinct outcome of rolling some dice, with its probability.
+
+    Outcomes are weighted by their multinomial coefficient rather than listing all 6 ** num_dice orderings.
+
+    :param num_dice: Number of dice rolled, 0 - 6.
+    :return: Tuple of (code, probability) pairs.
+    """
+    outcomes = []
+    for dice in combinations_with_replacement(range(1, 7), num_dice):
+        code = encode(dice)
+        orderings = factorial(num_dice)
+        for count in to_counts(code):
+            orderings //= factorial(count)
+        outcomes.append((code, orderings / 6 ** num_dice))
+    return tuple(outcomes)
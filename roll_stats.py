@@ -0,0 +1,41 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+from functools import lru_cache
+from roll_codes import rolls
+from score_table import table
+
+
+@lru_cache(maxsize=None)
+def score_distribution(num_dice: int) -> dict:
+    """Exact distribution of the best score a roll of num_dice can keep.
+
+    Each distinct outcome is weighted by its multinomial probability, so at most 462 outcomes are scored rather
+    than all 6 ** num_dice orderings.
+
+    :param num_dice: Number of dice rolled, 1 - 6.
+    :return: Dict of score: probability, sorted by score. A score of 0 is a farkle.
+    """
+    distribution = {}
+    for roll, probability in rolls(num_dice):
+        score = table[roll].score
+        distribution[score] = distribution.get(score, 0.) + probability
+    return dict(sorted(distribution.items()))
+
+
+def farkle_chance(num_dice: int) -> float:
+    """Probability a roll of num_dice has no scoring dice.
+
+    :param num_dice: Number of dice rolled, 1 - 6.
+    :return: Probability.
+    """
+    return score_distribution(num_dice).get(0, 0.)
+
+
+@lru_cache(maxsize=None)
+def expected_score(num_dice: int) -> float:
+    """Average best score a roll of num_dice can keep, counting farkles as 0.
+
+    :param num_dice: Number of dice rolled, 1 - 6.
+    :return: Expected score.
+    """
+    return sum(score * probability for score, probability in score_distribution(num_dice).items())
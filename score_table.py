@@ -0,0 +1,49 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+from collections import Counter, namedtuple
+from roll_codes import codes, decode, from_counts
+from scoring_rules import scoring_rules
+
+Score = namedtuple('Score', 'score errors keep three_pair straight')
+
+
+def _is_three_pair(counts: Counter) -> bool:
+    return sorted(counts.values()) == [2, 2, 2]
+
+
+def _is_straight(counts: Counter) -> bool:
+    return len(counts) == 6
+
+
+def _score(counts: Counter) -> int:
+    """Score a roll the way Game.keep_score always has."""
+    score = sum(scoring_rules[die - 1][count - 1] for die, count in counts.items())
+    if score < 1500 and (_is_straight(counts) or _is_three_pair(counts)):
+        score = 1500
+    return score
+
+
+def _errors(counts: Counter) -> tuple:
+    """Faces that score nothing as kept, lowest first. Game.validate_choice puts them in the order they were chosen."""
+    if _is_three_pair(counts) or _is_straight(counts):
+        return ()
+    return tuple(die for die, count in counts.items() if scoring_rules[die - 1][count - 1] == 0)
+
+
+def _keep(code: int, counts: Counter) -> int:
+    """Code of every scoring die of a roll, the way Game.choose_dice picks them."""
+    if _is_three_pair(counts) or _is_straight(counts):
+        return code
+    return from_counts(counts[die] if counts[die] and scoring_rules[die - 1][counts[die] - 1] > 0 else 0
+                       for die in range(1, 7))
+
+
+# code -> Score for every multiset of 0 - 6 dice.
+table = {}
+for _code in codes:
+    _counts = Counter(decode(_code))
+    table[_code] = Score(_score(_counts),
+                         _errors(_counts),
+                         _keep(_code, _counts),
+                         _is_three_pair(_counts),
+                         _is_straight(_counts))
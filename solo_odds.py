@@ -0,0 +1,133 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+import mmap
+import os
+from functools import lru_cache
+from game_rules import threshold
+from turn_solver import roll_kernels, step
+from win_solver import save, tables
+
+# the largest points goal and turn limit SoloGoalScreen offers.
+max_goal = 15000
+max_turns = 30
+
+
+def table_path(goal: int = max_goal, turns: int = max_turns) -> str:
+    return os.path.join(tables, f'solo_{goal}_{turns}.u16')
+
+
+def build(goal: int = max_goal, turns: int = max_turns):
+    """Solve the chance of scoring points within a number of turns under best play, for every smaller goal too.
+
+    Each turn is played to maximize the chance of finishing in the turns left, so a turn's value of banking t
+    points is the chance of scoring the rest in one turn fewer. All goals are solved together, a turn at a time.
+
+    :param goal: Largest points goal, a multiple of step.
+    :param turns: Largest turn limit.
+    :return: (2, turns + 1, goal // step + 1) float64 NumPy array. [0, k, d] is the chance of scoring d * step more
+        points in k turns for a player on the board, [1, k, d] for one who still needs 500 points in a turn.
+    """
+    import numpy as np
+
+    size = goal // step
+    entry = threshold // step
+    # turn points past which every goal is reached, or the player is on the board.
+    top = max(size, entry)
+    kernels = roll_kernels()
+
+    chances = np.zeros((2, turns + 1, size + 1))
+    chances[:, :, 0] = 1.
+    needed = np.arange(1, size + 1)
+    points = np.arange(top + 101)
+    remaining = np.maximum(needed[:, np.newaxis] - points, 0)
+    short = points < entry
+
+    for turn in range(1, turns + 1):
+        on_board = chances[0, turn - 1]
+        farkle_value = chances[:, turn - 1, 1:]
+        bank = np.repeat(on_board[remaining][np.newaxis], 2, axis=0)
+        # players not on the board get nothing from banking under 500 points.
+        bank[1][:, short] = farkle_value[1][:, np.newaxis]
+        bank[:, :, 0] = farkle_value
+
+        values = np.repeat(bank[:, :, np.newaxis, :], 7, axis=2)
+        for point in range(top - 1, -1, -1):
+            # goals of point or fewer steps are reached by banking, so only the rows after them need solving. A player
+            # not on the board can't bank under 500 points though, so until then every row is solved.
+            first = point if point >= entry else 0
+            view = values[:, first:]
+            for num_dice, farkle, probabilities, dice_left, steps in kernels:
+                best = view[:, :, dice_left, point + steps].max(axis=3)
+                rolled = best @ probabilities + farkle * farkle_value[:, first:]
+                view[:, :, num_dice, point] = np.maximum(bank[:, first:, point], rolled)
+        chances[:, turn, 1:] = values[:, :, 6, 0]
+    return chances
+
+
+class SoloTable:
+
+    """Chances of finishing challenges, memory-mapped from a table built by solo_odds.build.
+
+    """
+
+    def __init__(self, path: str = None, goal: int = max_goal, turns: int = max_turns):
+        self.goal = goal
+        self.turns = turns
+        with open(path or table_path(goal, turns), 'rb') as table:
+            self._map = mmap.mmap(table.fileno(), 0, access=mmap.ACCESS_READ)
+        self._chances = memoryview(self._map).cast('H')
+
+    def chance(self, point_goal: int, turn_limit: int) -> float:
+        """Chance a new player scores point_goal within turn_limit turns.
+
+        :param point_goal: Points goal, at most the table's goal.
+        :param turn_limit: Turns allowed, at most the table's turns.
+        :return: Probability.
+        """
+        size = self.goal // step + 1
+        return self._chances[((self.turns + 1) + turn_limit) * size + point_goal // step] / 65535
+
+
+@lru_cache(maxsize=None)
+def solo_table():
+    """Load the shipped challenge table, or None if it hasn't been built."""
+    if not os.path.exists(table_path()):
+        return None
+    return SoloTable()
+
+
+def table_covers(point_goal: int, turn_limit: int) -> bool:
+    """Whether success_chance can look a challenge up in the shipped table rather than solve it.
+
+    :param point_goal: Points goal.
+    :param turn_limit: Turns allowed.
+    :return: True if the shipped table has the challenge.
+    """
+    table = solo_table()
+    return bool(table) and point_goal <= table.goal and turn_limit <= table.turns
+
+
+@lru_cache(maxsize=None)
+def success_chance(point_goal: int, turn_limit: int) -> float:
+    """Chance of finishing a challenge under best play.
+
+    Looked up in the shipped table when it covers the challenge, solved on first use otherwise. A solve takes
+    seconds for the biggest challenges, so callers on the main thread should check table_covers first.
+
+    :param point_goal: Points goal.
+    :param turn_limit: Turns allowed.
+    :return: Probability.
+    """
+    point_goal = -(-point_goal // step) * step
+    if table_covers(point_goal, turn_limit):
+        return solo_table().chance(point_goal, turn_limit)
+    return float(build(point_goal, turn_limit)[1, turn_limit, point_goal // step])
+
+
+def main():
+    save(build(), table_path())
+    print(f'Wrote {table_path()}')
+
+
+if __name__ == "__main__":
+    main()
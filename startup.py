@@ -0,0 +1,30 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+"""Timing of the app's startup phases.
+
+main.py imports this before anything else and marks the end of each phase. The clock starts here, so time spent
+starting Python itself isn't counted.
+"""
+
+import time
+
+started = time.perf_counter()
+phases = []
+_last = started
+
+
+def mark(phase: str) -> None:
+    """Record that phase just finished.
+
+    :param phase: Phase name, like 'imports' or 'first frame'.
+    """
+    global _last
+    now = time.perf_counter()
+    phases.append((phase, now - _last))
+    _last = now
+
+
+def report() -> str:
+    """Each phase's time and the total, in milliseconds."""
+    parts = [f'{phase} {seconds * 1000:.0f} ms' for phase, seconds in phases]
+    return ', '.join(parts + [f'total {(_last - started) * 1000:.0f} ms'])
@@ -0,0 +1,107 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+"""Plays the rules of GameEngine through scripted dice, and replays a logged game."""
+
+import unittest
+from dice import DiceSource
+from engine import GameEngine, replay
+from game_rules import threshold
+from turn_solver import points_policy
+
+
+class ScriptedDice:
+
+    """Dice source rolling a fixed list of rolls in order, checking each is as many dice as asked for.
+
+    """
+
+    seed = 0
+
+    def __init__(self, *rolls):
+        self.rolls = list(rolls)
+
+    def roll(self, num_dice: int) -> list:
+        roll = self.rolls.pop(0)
+        if len(roll) != num_dice:
+            raise AssertionError(f'Rolled {num_dice} dice, the script has {roll}.')
+        return roll
+
+
+class TestGameEngine(unittest.TestCase):
+
+    def test_entry_threshold(self):
+        engine = GameEngine(['test'], ScriptedDice([5, 2, 3, 4, 6, 6], [1, 1, 1, 2, 3, 4], [5, 2, 3, 4, 6, 6]))
+        player = engine.current_player
+        engine.roll()
+        engine.keep([5])
+        engine.end_turn()
+        self.assertEqual(player.total_score, 0)
+        engine.roll()
+        engine.keep([1, 1, 1])
+        engine.end_turn()
+        self.assertEqual(player.total_score, 1000)
+        # once on the board any valid basket banks.
+        engine.roll()
+        engine.keep([5])
+        engine.end_turn()
+        self.assertEqual(player.total_score, 1050)
+        self.assertEqual(engine.turns, 4)
+
+    def test_hot_dice(self):
+        engine = GameEngine(['test'], ScriptedDice([1, 1, 1, 5, 5, 5], [2, 2, 2, 3, 4, 6]))
+        engine.roll()
+        self.assertTrue(engine.keep([1, 1, 1, 5, 5, 5]))
+        self.assertEqual(engine.dice_left, 6)
+        engine.roll()
+        self.assertEqual(engine.turn_points, 1500)
+        engine.keep([2, 2, 2])
+        engine.end_turn()
+        self.assertEqual(engine.current_player.total_score, 1700)
+
+    def test_invalid_basket_loses_turn(self):
+        engine = GameEngine(['first', 'second'], ScriptedDice([1, 1, 1, 2, 3, 4], [5, 2, 3]))
+        first, second = engine.game.player_list
+        engine.roll()
+        engine.keep([1, 1, 1])
+        engine.roll()
+        self.assertFalse(engine.keep([2]))
+        engine.end_turn()
+        self.assertEqual(first.total_score, 0)
+        self.assertEqual(first.round_score, 0)
+        self.assertIs(engine.current_player, second)
+
+    def test_last_chance(self):
+        engine = GameEngine(['first', 'second', 'third'],
+                            ScriptedDice([1, 1, 1, 2, 3, 4], [1, 1, 1, 1, 2, 3], [2, 2, 3, 4, 6, 6]), goal=1000)
+        first, second, third = engine.game.player_list
+        engine.roll()
+        engine.keep([1, 1, 1])
+        engine.end_turn()
+        # reaching the goal gives everyone else one last turn, in order.
+        self.assertIs(engine.current_player, second)
+        engine.roll()
+        engine.keep([1, 1, 1, 1])
+        engine.end_turn()
+        self.assertIs(engine.current_player, third)
+        # a farkle ends the last turn, and the game.
+        engine.roll()
+        self.assertTrue(engine.over)
+        self.assertEqual(engine.winners, [first, second, third])
+        self.assertEqual(engine.results(), [second])
+        self.assertRaises(ValueError, engine.roll)
+
+    def test_replay(self):
+        engine = GameEngine(['first', 'second'], DiceSource(0))
+        while not engine.over:
+            engine.play_turn(points_policy(0 if engine.current_player.total_score else threshold))
+        replayed = replay(bytes(engine.game.log.data))
+        self.assertTrue(replayed.over)
+        self.assertEqual(replayed.turns, engine.turns)
+        self.assertEqual([player.total_score for player in replayed.game.player_list],
+                         [player.total_score for player in engine.game.player_list])
+        self.assertEqual([player.name for player in replayed.results()],
+                         [player.name for player in engine.results()])
+
+
+if __name__ == "__main__":
+    unittest.main()
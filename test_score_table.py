@@ -0,0 +1,79 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+"""Pins the table based scorer in logic.Game to the original Counter based one, for every ordered roll."""
+
+import unittest
+from collections import Counter, namedtuple
+from itertools import product
+from logic import Game
+from roll_codes import encode
+from scoring_rules import scoring_rules
+
+# stands in for a DieScatter, which choose_dice only asks for its id.
+Die = namedtuple('Die', 'id')
+
+
+def is_three_pair(choice):
+    choice = sorted(choice)
+    return (len(choice) == 6 and
+            choice[0] == choice[1] and
+            choice[2] == choice[3] and
+            choice[4] == choice[5] and
+            (choice[0] != choice[2] and choice[0] != choice[4]) and
+            choice[2] != choice[4])
+
+
+def is_straight(choice):
+    return sorted(choice) == list(range(1, 7))
+
+
+def keep_score(choice):
+    counts = Counter(choice)
+    score = sum(scoring_rules[die - 1][count - 1] for die, count in counts.items())
+    if score < 1500 and (is_straight(choice) or is_three_pair(choice)):
+        score = 1500
+    return score
+
+
+def validate_choice(choice):
+    counts = Counter(choice)
+    if is_three_pair(choice) and sum(scoring_rules[die - 1][count - 1] for die, count in counts.items()) < 1500:
+        return []
+    if is_straight(choice):
+        return []
+    return [die for die, count in counts.items()
+            if scoring_rules[die - 1][count - 1] == 0 and not is_straight(choice) and not is_three_pair(choice)]
+
+
+def choose_dice(roll):
+    nums = [int(die.id) for die in roll]
+    counts = Counter(nums)
+    if is_three_pair(nums) and sum(scoring_rules[die - 1][count - 1] for die, count in counts.items()) < 1500:
+        return roll
+    if is_straight(nums):
+        return roll
+    temp = [die for die, count in counts.items() for _ in range(count) if scoring_rules[die - 1][count - 1] > 0]
+    return [die for die in roll if int(die.id) in temp]
+
+
+class TestScoreTable(unittest.TestCase):
+
+    def test_every_ordered_roll(self):
+        game = Game(['test'])
+        for num_dice in range(7):
+            for roll in product(range(1, 7), repeat=num_dice):
+                choice = list(roll)
+                dice = [Die(str(face)) for face in roll]
+                code = encode(choice)
+                self.assertEqual(game.keep_score(choice), keep_score(choice), choice)
+                self.assertEqual(game.keep_score(code), keep_score(choice), choice)
+                self.assertEqual(game.validate_choice(choice), validate_choice(choice), choice)
+                self.assertEqual(sorted(game.validate_choice(code)), sorted(validate_choice(choice)), choice)
+                self.assertEqual(game.choose_dice(dice), choose_dice(dice), choice)
+                self.assertEqual(game.choose_dice(code), encode(int(die.id) for die in choose_dice(dice)), choice)
+                self.assertEqual(game.is_three_pair(choice), is_three_pair(choice), choice)
+                self.assertEqual(game.is_straight(choice), is_straight(choice), choice)
+
+
+if __name__ == "__main__":
+    unittest.main()
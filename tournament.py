@@ -0,0 +1,141 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+import argparse
+import csv
+import math
+import os
+import time
+from functools import lru_cache
+from multiprocessing import Pool
+from dice import DiceSource, game_seed
+from engine import GameEngine
+from game_rules import threshold
+from turn_outcomes import HeuristicPolicy, ThresholdPolicy
+from turn_solver import points_policy
+from win_solver import win_table
+
+
+def heuristic(engine):
+    return HeuristicPolicy()
+
+
+def points(engine):
+    return points_policy(0 if engine.current_player.total_score else threshold)
+
+
+def win(engine):
+    """Play to beat the strongest opponent, like a hard comp_player."""
+    current_player = engine.current_player
+    table = win_table()
+    if table and not engine.winners:
+        theirs = max(player.total_score for player in engine.players if player is not current_player)
+        if current_player.total_score < table.goal and theirs < table.goal:
+            return table.turn_policy(current_player.total_score, theirs)
+    return points(engine)
+
+
+def stop_at(points_goal: int, min_dice: int = 0):
+    """Keep every scoring die and bank at points_goal, or at 500 until on the board."""
+    def policy(engine):
+        entry = 0 if engine.current_player.total_score else threshold
+        return ThresholdPolicy(max(points_goal, entry), min_dice)
+    return policy
+
+
+@lru_cache(maxsize=None)
+def strategy(name: str):
+    """Look up a strategy by name.
+
+    :param name: 'heuristic', 'points', 'win' or 'threshold:<points>[:<min dice>]'.
+    :return: Function of a GameEngine, the turn policy for its current player.
+    """
+    if name.startswith('threshold:'):
+        return stop_at(*(int(arg) for arg in name.split(':')[1:]))
+    strategies = {'heuristic': heuristic, 'points': points, 'win': win}
+    if name not in strategies:
+        raise ValueError(f'Unknown strategy {name!r}.')
+    return strategies[name]
+
+
+def play_game(task: tuple) -> tuple:
+    """Play one game between strategies.
+
+    :param task: Tuple of (game number, dice seed, strategy names in turn order).
+    :return: Tuple of (game number, dice seed, names, final totals, turns played, names tied for the win, framed
+        game log).
+    """
+    number, seed, names = task
+    engine = GameEngine(names, DiceSource(seed))
+    while not engine.over:
+        engine.play_turn(strategy(engine.current_player.name)(engine))
+    totals = [player.total_score for player in engine.game.player_list]
+    winners = [player.name for player in engine.results()]
+    return number, seed, names, totals, engine.turns, winners, engine.game.log.record()
+
+
+def wilson(wins: float, games: int, z: float = 1.96) -> tuple:
+    """95% Wilson score interval for a win rate."""
+    rate = wins / games
+    center = (rate + z * z / (2 * games)) / (1 + z * z / games)
+    spread = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games)) / (1 + z * z / games)
+    return center - spread, center + spread
+
+
+def run(names: list, games: int, seed: int = 0, workers: int = None, out: str = 'tournament.csv',
+        log: str = None) -> dict:
+    """Play games between strategies on every core, writing each result to out as it finishes.
+
+    Seats rotate every game so no strategy always goes first, and each game rolls from its own seeded stream.
+
+    :param names: Strategy names, at least two and all different.
+    :param games: Number of games.
+    :param seed: Seed of the series, each game's dice seed is derived from it and the game number.
+    :param workers: Number of processes, defaults to every core.
+    :param out: CSV file for per-game results.
+    :param log: File to append every game's replay log to, or None.
+    :return: Dict of strategy name: wins, with ties split between the players tied.
+    """
+    for name in names:
+        strategy(name)
+    tasks = ((number, game_seed(seed, number), names[number % len(names):] + names[:number % len(names)])
+             for number in range(games))
+    wins = dict.fromkeys(names, 0.)
+    turns = 0
+    start = time.perf_counter()
+    with Pool(workers) as pool, open(out, 'w', newline='') as results, open(log or os.devnull, 'ab') as logs:
+        writer = csv.writer(results)
+        writer.writerow(['game', 'seed', 'order', 'totals', 'turns', 'winners'])
+        for number, dice_seed, order, totals, played, winners, record in pool.imap_unordered(play_game, tasks,
+                                                                                             chunksize=64):
+            writer.writerow([number, dice_seed, ' '.join(order), ' '.join(map(str, totals)), played,
+                             ' '.join(winners)])
+            logs.write(record)
+            for winner in winners:
+                wins[winner] += 1 / len(winners)
+            turns += played
+    elapsed = time.perf_counter() - start
+
+    for name in names:
+        low, high = wilson(wins[name], games)
+        print(f'{name:>20}: {wins[name] / games:6.1%} win rate (95% CI {low:.1%} - {high:.1%})')
+    print(f'{turns / games:.1f} turns per game, {games / elapsed:,.0f} games per second')
+    return wins
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play computer strategies against each other.')
+    parser.add_argument('strategies', nargs='+',
+                        help="'heuristic', 'points', 'win' or 'threshold:<points>[:<min dice>]'")
+    parser.add_argument('-n', '--games', type=int, default=10000)
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count())
+    parser.add_argument('-o', '--out', default='tournament.csv')
+    parser.add_argument('-l', '--log', help='append replay logs of every game to this file')
+    args = parser.parse_args()
+    if len(args.strategies) < 2 or len(set(args.strategies)) < len(args.strategies):
+        parser.error('Give at least two different strategies.')
+    run(args.strategies, args.games, args.seed, args.workers, args.out, args.log)
+
+
+if __name__ == "__main__":
+    main()
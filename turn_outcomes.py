@@ -0,0 +1,136 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+import heapq
+from functools import lru_cache
+from keeps import Keep
+from roll_codes import rolls, size
+from score_table import table
+
+
+def greedy_keep(roll: int):
+    """Keep every scoring die, the way Game.choose_dice does.
+
+    :param roll: Roll code.
+    :return: Keep, or None if the roll farkles.
+    """
+    keep = table[roll].keep
+    if not keep:
+        return None
+    return Keep(keep, table[keep].score, size(roll) - size(keep) or 6)
+
+
+@lru_cache(maxsize=None)
+def greedy_moves(dice_left: int) -> tuple:
+    """Where a roll of dice_left can take a turn when every scoring die is kept.
+
+    :param dice_left: Dice rolled.
+    :return: Tuple of ((score, dice_left), probability) pairs, with (0, 0) for a farkle.
+    """
+    grouped = {}
+    for roll, probability in rolls(dice_left):
+        keep = greedy_keep(roll)
+        move = (keep.score, keep.dice_left) if keep else (0, 0)
+        grouped[move] = grouped.get(move, 0.) + probability
+    return tuple(grouped.items())
+
+
+class ThresholdPolicy:
+
+    """Keep every scoring die and bank at stop_at points or when min_dice or fewer dice are left to roll.
+
+    """
+
+    def __init__(self, stop_at, min_dice=0):
+        self.stop_at = stop_at
+        self.min_dice = min_dice
+
+    def __eq__(self, other):
+        return (isinstance(other, ThresholdPolicy) and
+                (self.stop_at, self.min_dice) == (other.stop_at, other.min_dice))
+
+    def __hash__(self):
+        return hash((ThresholdPolicy, self.stop_at, self.min_dice))
+
+    def __repr__(self):
+        return f'ThresholdPolicy({self.stop_at}, {self.min_dice})'
+
+    def should_roll(self, points: int, dice_left: int) -> bool:
+        return points < self.stop_at and dice_left > self.min_dice
+
+    def best_keep(self, points: int, roll: int):
+        return greedy_keep(roll)
+
+    def moves(self, points: int, dice_left: int) -> tuple:
+        return greedy_moves(dice_left)
+
+
+class HeuristicPolicy:
+
+    """The computer player's original rule: keep every scoring die, always roll six dice, and bank with 500 or
+    more points and three or fewer dice to roll.
+
+    """
+
+    def __eq__(self, other):
+        return isinstance(other, HeuristicPolicy)
+
+    def __hash__(self):
+        return hash(HeuristicPolicy)
+
+    def __repr__(self):
+        return 'HeuristicPolicy()'
+
+    def should_roll(self, points: int, dice_left: int) -> bool:
+        return dice_left == 6 or not (points >= 500 and dice_left <= 3)
+
+    def best_keep(self, points: int, roll: int):
+        return greedy_keep(roll)
+
+    def moves(self, points: int, dice_left: int) -> tuple:
+        return greedy_moves(dice_left)
+
+
+@lru_cache(maxsize=256)
+def turn_distribution(policy, threshold: int = 0, limit: int = 30000) -> dict:
+    """Exact distribution of the points a turn banks under a policy.
+
+    The turn is a Markov chain over (turn points, dice left). Points only grow, so pushing probability through
+    states in order of points visits each reachable state once, after everything leading into it.
+
+    :param policy: Object with should_roll(points, dice_left) and moves(points, dice_left), like TurnPolicy.
+    :param threshold: Fewest points that count when banked, 500 before a player is on the board.
+    :param limit: Turn points at which the turn is banked regardless of policy.
+    :return: Dict of banked points: probability, sorted by points. Farkles and banks under threshold are 0.
+    """
+    outcomes = {}
+    chance = {(0, 6): 1.}
+    queue = [(0, 6)]
+    while queue:
+        state = heapq.heappop(queue)
+        points, dice_left = state
+        reach = chance.pop(state)
+        # every turn starts with a roll.
+        if points and (points >= limit or not policy.should_roll(points, dice_left)):
+            banked = points if points >= threshold else 0
+            outcomes[banked] = outcomes.get(banked, 0.) + reach
+            continue
+        for (score, next_dice), probability in policy.moves(points, dice_left):
+            if not score:
+                outcomes[0] = outcomes.get(0, 0.) + reach * probability
+                continue
+            after = (points + score, next_dice)
+            if after not in chance:
+                chance[after] = 0.
+                heapq.heappush(queue, after)
+            chance[after] += reach * probability
+    return dict(sorted(outcomes.items()))
+
+
+def expected_points(policy, threshold: int = 0) -> float:
+    """Average points a turn banks under a policy.
+
+    :param policy: Banking policy.
+    :param threshold: Fewest points that count when banked.
+    :return: Expected points.
+    """
+    return sum(points * probability for points, probability in turn_distribution(policy, threshold).items())
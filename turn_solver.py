@@ -0,0 +1,163 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+from functools import lru_cache
+from keeps import legal_keeps
+from roll_codes import rolls
+
+# Every score is a multiple of 50, so turn points are tracked in steps of 50.
+step = 50
+
+
+@lru_cache(maxsize=None)
+def roll_choices(num_dice: int) -> tuple:
+    """Group the outcomes of rolling num_dice by what they let a player do next.
+
+    For each outcome only the best score for each number of dice left is worth considering, and outcomes offering
+    the same options are merged.
+
+    :param num_dice: Number of dice rolled, 1 - 6.
+    :return: Tuple of (farkle probability, ((probability, ((steps, dice_left), ...)), ...)).
+    """
+    farkle = 0.
+    groups = {}
+    for roll, probability in rolls(num_dice):
+        best = {}
+        for keep in legal_keeps(roll):
+            if keep.score > best.get(keep.dice_left, 0):
+                best[keep.dice_left] = keep.score
+        if not best:
+            farkle += probability
+            continue
+        options = tuple(sorted((score // step, dice_left) for dice_left, score in best.items()))
+        groups[options] = groups.get(options, 0.) + probability
+    return farkle, tuple((probability, options) for options, probability in groups.items())
+
+
+def roll_kernels() -> list:
+    """roll_choices for every roll size as NumPy arrays, for solving many states at once.
+
+    Each size's options are padded to the same width by repeating one, which leaves their max unchanged.
+
+    :return: List of (num_dice, farkle probability, group probabilities, dice_left[group, option],
+        steps[group, option]) for 1 - 6 dice.
+    """
+    import numpy as np
+
+    kernels = []
+    for num_dice in range(1, 7):
+        farkle, groups = roll_choices(num_dice)
+        width = max(len(options) for _, options in groups)
+        padded = [list(options) + [options[0]] * (width - len(options)) for _, options in groups]
+        kernels.append((num_dice,
+                        farkle,
+                        np.array([probability for probability, _ in groups]),
+                        np.array([[dice_left for _, dice_left in options] for options in padded]),
+                        np.array([[steps for steps, _ in options] for options in padded])))
+    return kernels
+
+
+def solve_turn(bank, farkle: float, limit: int) -> tuple:
+    """Find the best roll or bank decision for every state of a single turn.
+
+    A state is the turn points so far and the number of dice left to roll. Points only grow during a turn, so
+    states are solved from the highest points down, each once.
+
+    :param bank: Function of turn points, the value of ending the turn with them.
+    :param farkle: Value of rolling no scoring dice.
+    :param limit: Turn points at which the turn always ends, a multiple of step.
+    :return: Tuple of (values, decisions). values[dice_left][points // step] is the value of a state under best play
+        and decisions[dice_left][points // step] is 1 where rolling beats banking, for points below limit.
+    """
+    top = limit // step
+    # the biggest single keep is worth 5000 points, so values are padded 100 steps past limit.
+    banked = [bank(points * step) for points in range(top + 101)]
+    values = [None] + [banked[:] for _ in range(6)]
+    decisions = [None] + [bytearray(top) for _ in range(6)]
+    choices = [None] + [roll_choices(num_dice) for num_dice in range(1, 7)]
+
+    for points in range(top - 1, -1, -1):
+        for num_dice in range(1, 7):
+            farkle_chance, groups = choices[num_dice]
+            expected = farkle_chance * farkle
+            for probability, options in groups:
+                expected += probability * max(values[dice_left][points + steps] for steps, dice_left in options)
+            if expected > banked[points]:
+                values[num_dice][points] = expected
+                decisions[num_dice][points] = 1
+    return values, decisions
+
+
+class TurnPolicy:
+
+    """Best play for one turn under a banking rule, solved once and then looked up.
+
+    """
+
+    def __init__(self, bank, farkle=0., limit=20000):
+        """Solve every state of the turn.
+
+        :param bank: Function of turn points, the value of ending the turn with them.
+        :param farkle: Value of rolling no scoring dice.
+        :param limit: Turn points at which the turn always ends.
+        """
+        self.bank = bank
+        self.limit = limit
+        self.values, self.decisions = solve_turn(bank, farkle, limit)
+        self.best_keep = lru_cache(maxsize=4096)(self.best_keep)
+        self.moves = lru_cache(maxsize=4096)(self.moves)
+
+    def value(self, points: int, dice_left: int) -> float:
+        """Value of a state under best play.
+
+        :param points: Turn points so far.
+        :param dice_left: Dice left to roll.
+        :return: Expected value.
+        """
+        if points >= self.limit:
+            return self.bank(points)
+        return self.values[dice_left][points // step]
+
+    def should_roll(self, points: int, dice_left: int) -> bool:
+        """Decide whether to roll again or bank.
+
+        :param points: Turn points so far.
+        :param dice_left: Dice left to roll.
+        :return: True to roll, False to bank.
+        """
+        return points < self.limit and bool(self.decisions[dice_left][points // step])
+
+    def best_keep(self, points: int, roll: int):
+        """Choose the dice to keep from a roll.
+
+        :param points: Turn points before this roll.
+        :param roll: Roll code.
+        :return: The Keep leading to the most valuable state, or None if the roll farkles.
+        """
+        keeps = legal_keeps(roll)
+        if not keeps:
+            return None
+        return max(keeps, key=lambda keep: self.value(points + keep.score, keep.dice_left))
+
+    def moves(self, points: int, dice_left: int) -> tuple:
+        """Where a roll can take the turn when the best dice are kept.
+
+        :param points: Turn points before the roll.
+        :param dice_left: Dice rolled.
+        :return: Tuple of ((score, dice_left), probability) pairs, with (0, 0) for a farkle.
+        """
+        farkle, groups = roll_choices(dice_left)
+        grouped = {(0, 0): farkle}
+        for probability, options in groups:
+            steps, next_dice = max(options, key=lambda option: self.value(points + option[0] * step, option[1]))
+            grouped[steps * step, next_dice] = grouped.get((steps * step, next_dice), 0.) + probability
+        return tuple(grouped.items())
+
+
+@lru_cache(maxsize=None)
+def points_policy(threshold: int = 0) -> TurnPolicy:
+    """Policy maximizing expected points banked this turn.
+
+    :param threshold: Fewest points that can be banked, 500 before a player is on the board.
+    :return: A solved TurnPolicy.
+    """
+    return TurnPolicy(lambda points: points if points >= threshold else 0)
@@ -0,0 +1,203 @@
+# Copyright 2018 Paul Kutrich. All rights reserved.
+
+import mmap
+import os
+import sys
+from functools import lru_cache
+from game_rules import goal, threshold
+from last_chance import needed_points, reach_chance, reach_chances
+from turn_solver import TurnPolicy, roll_kernels, step
+
+# a player may keep rolling this far past the goal to stretch their lead before being made to bank.
+margin = 1000
+
+# opponent totals this close share a cached turn policy, which changes under 1% of roll or bank decisions.
+policy_bucket = 250
+
+# last chance targets can run past the goal by the margin plus the biggest single keep.
+reach_limit = margin + 5000 + threshold + step
+
+tables = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tables')
+
+
+def table_path(goal: int = goal) -> str:
+    return os.path.join(tables, f'win_{goal}.u16')
+
+
+def last_chance_fails(total: int, opponent: int, goal: int = goal) -> float:
+    """Chance a player banking total at or past the goal wins, given the opponent's last turn to beat it.
+
+    :param total: Banked total at or past goal.
+    :param opponent: Opponent's total.
+    :param goal: Points goal.
+    :return: Probability the opponent fails to pass total.
+    """
+    return 1. - reach_chance(needed_points(opponent, total))
+
+
+def build(goal: int = goal, tolerance: float = 1e-6):
+    """Solve the chance to win from the start of every turn of a two player game.
+
+    Turns that end with the mover's total increased are solved first, by descending sum of both totals. Pairs of
+    states with the same sum depend on each other through farkles and are iterated together until they settle.
+
+    :param goal: Points goal, a multiple of step.
+    :param tolerance: Largest change between iterations accepted as settled.
+    :return: (goal // step, goal // step) float64 NumPy array, chances[mine // step, theirs // step].
+    """
+    import numpy as np
+
+    size = goal // step
+    cap = (goal + margin) // step
+    entry = threshold // step
+    reach = np.array(reach_chances(goal + reach_limit)[6])
+    kernels = roll_kernels()
+
+    chances = np.zeros((size, size))
+    for total in range(2 * size - 2, -1, -1):
+        mine = np.arange(max(0, total - size + 1), min(size - 1, total) + 1)
+        theirs = total - mine
+        top = cap - mine.min()
+        points = np.arange(top + 101)
+        banked_total = mine[:, np.newaxis] + points
+
+        # value of banking each number of turn points, before the farkle value is known.
+        bank = np.empty((len(mine), top + 101))
+        reaching = banked_total >= size
+        needed = np.where(theirs[:, np.newaxis] == 0,
+                          np.maximum(banked_total - theirs[:, np.newaxis] + 1, entry),
+                          banked_total - theirs[:, np.newaxis] + 1)
+        # totals more than a keep past a pair's own cap are never reached, so clipping them is harmless.
+        bank[reaching] = 1. - reach[np.minimum(needed, len(reach) - 1)[reaching]]
+        below = ~reaching
+        bank[below] = 1. - chances[np.broadcast_to(theirs[:, np.newaxis], bank.shape)[below],
+                                   np.minimum(banked_total, size - 1)[below]]
+        bank[:, 0] = -1.
+        unbankable = (mine[:, np.newaxis] == 0) & (points < entry) & (points > 0)
+        forced = banked_total >= cap
+
+        # one more point for the opponent barely changes the odds, so start from the states solved last.
+        current = chances[mine, np.minimum(theirs + 1, size - 1)] if total < 2 * size - 2 else np.full(len(mine), .5)
+        while True:
+            # the pairs are listed by ascending mine, so the swapped state is the mirror position.
+            farkle_value = 1. - current[::-1]
+            bank_now = np.where(unbankable, farkle_value[:, np.newaxis], bank)
+            values = np.repeat(bank_now[:, np.newaxis, :], 7, axis=1)
+            for point in range(top - 1, -1, -1):
+                for num_dice, farkle, probabilities, dice_left, steps in kernels:
+                    best = values[:, dice_left, point + steps].max(axis=2)
+                    rolled = best @ probabilities + farkle * farkle_value
+                    values[:, num_dice, point] = np.where(forced[:, point], bank_now[:, point],
+                                                          np.maximum(bank_now[:, point], rolled))
+            settled = values[:, 6, 0]
+            change = np.abs(settled - current).max()
+            current = settled
+            if change < tolerance:
+                break
+        chances[mine, theirs] = current
+    return chances
+
+
+def save(chances, path: str) -> None:
+    """Quantize chances to uint16 and write them to path."""
+    import numpy as np
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.round(chances * 65535).astype(np.uint16).tofile(path)
+
+
+class WinTable:
+
+    """Win chances for a two player game, memory-mapped from a table built by win_solver.build.
+
+    """
+
+    def __init__(self, path: str = None, goal: int = goal):
+        """Map the table.
+
+        :param path: Table file, defaults to the shipped table for goal.
+        :param goal: Points goal the table was built for.
+        """
+        self.goal = goal
+        self.size = goal // step
+        with open(path or table_path(goal), 'rb') as table:
+            self._map = mmap.mmap(table.fileno(), 0, access=mmap.ACCESS_READ)
+        self._chances = memoryview(self._map).cast('H')
+        self._turn_policy = lru_cache(maxsize=1024)(self._turn_policy)
+
+    def chance(self, mine: int, theirs: int) -> float:
+        """Chance the player about to start a turn wins.
+
+        :param mine: Mover's total.
+        :param theirs: Opponent's total.
+        :return: Probability.
+        """
+        return self._chances[(mine // step) * self.size + theirs // step] / 65535
+
+    def bank_value(self, mine: int, theirs: int, points: int) -> float:
+        """Chance to win after banking points, or -1 if points can't be banked."""
+        total = mine + points
+        if not points or (not mine and points < threshold):
+            return -1.
+        if total >= self.goal:
+            return last_chance_fails(total, theirs, self.goal)
+        return 1. - self.chance(theirs, total)
+
+    def turn_policy(self, mine: int, theirs: int) -> TurnPolicy:
+        """Win maximizing policy for one turn, solved from the table.
+
+        A solve takes 20 - 60 ms, so policies are cached by the turn's limit, goal + margin - mine, and the
+        opponent's total rounded down to policy_bucket.
+
+        :param mine: Mover's total.
+        :param theirs: Opponent's total.
+        :return: TurnPolicy valuing states by chance to win.
+        """
+        return self._turn_policy(mine, theirs - theirs % policy_bucket)
+
+    def _turn_policy(self, mine: int, theirs: int) -> TurnPolicy:
+        farkle = 1. - self.chance(theirs, mine)
+        return TurnPolicy(lambda points: max(self.bank_value(mine, theirs, points), farkle),
+                          farkle=farkle,
+                          limit=self.goal + margin - mine)
+
+    def should_roll(self, mine: int, theirs: int, points: int, dice_left: int) -> bool:
+        """Decide whether to roll again or bank.
+
+        :param mine: Mover's total.
+        :param theirs: Opponent's total.
+        :param points: Turn points so far.
+        :param dice_left: Dice left to roll.
+        :return: True to roll, False to bank.
+        """
+        return self.turn_policy(mine, theirs).should_roll(points, dice_left)
+
+    def best_keep(self, mine: int, theirs: int, points: int, roll: int):
+        """Choose the dice to keep from a roll.
+
+        :param mine: Mover's total.
+        :param theirs: Opponent's total.
+        :param points: Turn points before this roll.
+        :param roll: Roll code.
+        :return: The Keep most likely to win, or None if the roll farkles.
+        """
+        return self.turn_policy(mine, theirs).best_keep(points, roll)
+
+
+@lru_cache(maxsize=None)
+def win_table(goal: int = goal):
+    """Load the win table for goal, or None if it hasn't been built."""
+    if not os.path.exists(table_path(goal)):
+        return None
+    return WinTable(goal=goal)
+
+
+def main():
+    goals = [int(arg) for arg in sys.argv[1:]] or [goal]
+    for points_goal in goals:
+        save(build(points_goal), table_path(points_goal))
+        print(f'Wrote {table_path(points_goal)}')
+
+
+if __name__ == "__main__":
+    main()